@@ -10,6 +10,14 @@ class Settings(BaseSettings):
     GOOGLE_MAPS_API_KEY: str = ""
     GOOGLE_APPLICATION_CREDENTIALS: str = ""
 
+    # Gemini (Vertex AI)
+    GEMINI_MODEL: str = "gemini-2.5-flash-preview-04-17"
+    GEMINI_TEMPERATURE: float = 0.7
+    GEMINI_MAX_OUTPUT_TOKENS: int = 8192
+    GEMINI_TOP_P: float = 0.95
+    GEMINI_WARMUP: bool = False
+    PROMPT_PLACES_TOKEN_BUDGET: int = 1500  # 0 = no limit
+
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "tripstellar"
@@ -19,6 +27,120 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_MINUTES: int = 1440
 
+    # Password hashing: bcrypt cost factor (2^rounds) and worker threads
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Authenticated-user cache; read-only routes may trust signed claims instead
+    AUTH_CACHE_TTL: int = 60
+    AUTH_CACHE_MAX_BYTES: int = 2_000_000
+    AUTH_TRUST_CLAIMS_ON_READS: bool = False
+
+    # Outbound HTTP (shared client for Google APIs)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_TIMEOUT_PLACES_SEARCH: float = 15.0
+    HTTP_TIMEOUT_PLACES_DETAILS: float = 15.0
+    HTTP_TIMEOUT_AUTOCOMPLETE: float = 10.0
+    HTTP_TIMEOUT_DIRECTIONS: float = 15.0
+    HTTP_TIMEOUT_DISTANCE_MATRIX: float = 15.0
+    HTTP_TIMEOUT_GEOCODE: float = 10.0
+
+    # Outbound scheduler: per-API quotas (requests/s, 0 = unlimited), deadlines and retries
+    GOOGLE_RATE_PLACES_SEARCH: float = 10.0
+    GOOGLE_RATE_PLACES_DETAILS: float = 10.0
+    GOOGLE_RATE_AUTOCOMPLETE: float = 20.0
+    GOOGLE_RATE_DIRECTIONS: float = 50.0
+    GOOGLE_RATE_DISTANCE_MATRIX_ELEMENTS: float = 1000.0
+    GOOGLE_RATE_GEOCODE: float = 50.0
+    GOOGLE_RATE_BURST_SECONDS: float = 1.0
+    OUTBOUND_DEADLINE_SECONDS: float = 20.0
+    OUTBOUND_BACKGROUND_DEADLINE_SECONDS: float = 120.0
+    OUTBOUND_MAX_RETRIES: int = 3
+    OUTBOUND_BACKOFF_BASE: float = 0.25
+    OUTBOUND_BACKOFF_MAX: float = 4.0
+
+    # Circuit breakers per Google API, with last-known-good fallback responses
+    CIRCUIT_WINDOW: int = 20
+    CIRCUIT_MIN_CALLS: int = 10
+    CIRCUIT_FAILURE_RATIO: float = 0.5
+    CIRCUIT_SLOW_CALL_SECONDS: float = 5.0
+    CIRCUIT_OPEN_SECONDS: float = 30.0
+    CIRCUIT_HALF_OPEN_PROBES: int = 1
+    CIRCUIT_FALLBACK_MAX_BYTES: int = 32_000_000
+    CIRCUIT_FALLBACK_TTL: int = 604800
+
+    # Places cache (in-process, per-namespace byte budgets)
+    PLACE_CACHE_SEARCH_MAX_BYTES: int = 4_000_000
+    PLACE_CACHE_SEARCH_TTL: int = 3600
+    PLACE_CACHE_DETAILS_MAX_BYTES: int = 8_000_000
+    PLACE_CACHE_DETAILS_TTL: int = 3600
+    AUTOCOMPLETE_CACHE_MAX_BYTES: int = 2_000_000
+    AUTOCOMPLETE_CACHE_TTL: int = 300
+
+    # Local prefix index for destination autocomplete
+    AUTOCOMPLETE_INDEX_MAX_ENTRIES: int = 5000
+    AUTOCOMPLETE_SEED_LIMIT: int = 2000
+
+    # Distance Matrix engine
+    DISTANCE_MATRIX_CONCURRENCY: int = 4
+    DISTANCE_MATRIX_ANON_MAX_ELEMENTS: int = 625  # 25 x 25
+    DISTANCE_MATRIX_MAX_ELEMENTS: int = 10000
+    DISTANCE_CACHE_MAX_BYTES: int = 8_000_000
+    DISTANCE_CACHE_TTL: int = 86400
+
+    # Geocoding cache (address -> coordinates) and batch parallelism
+    GEOCODE_CACHE_MAX_BYTES: int = 4_000_000
+    GEOCODE_CACHE_FRESH_SECONDS: int = 2_592_000
+    GEOCODE_CONCURRENCY: int = 8
+    GEOCODE_BATCH_ANON_MAX_ADDRESSES: int = 10
+
+    # Whole-day routes (Directions legs)
+    ROUTE_LEG_CACHE_MAX_BYTES: int = 16_000_000
+    ROUTE_LEG_CACHE_TTL: int = 86400
+    DAY_ROUTE_ANON_MAX_STOPS: int = 12
+
+    # Geo index over seen places (nearby queries)
+    GEO_INDEX_CELL_KM: float = 1.0
+    GEO_INDEX_MAX_PLACES: int = 50000
+    GEO_INDEX_MIN_RESULTS: int = 5
+
+    # Places cache (persistent second tier)
+    PLACE_CACHE_BACKEND: str = "mongo"  # mongo | sqlite | none
+    PLACE_CACHE_SQLITE_PATH: str = "place_cache.db"
+    PLACE_CACHE_FRESH_SECONDS: int = 3600
+    PLACE_CACHE_MAX_STALE_SECONDS: int = 604800
+
+    # Chunked generation for long trips (0 disables)
+    GENERATION_CHUNK_MIN_DAYS: int = 6
+    GENERATION_CHUNK_DAYS: int = 3
+    GENERATION_CHUNK_CONCURRENCY: int = 8
+
+    # Reorder each day's activities by place coordinates after generation
+    ROUTE_OPTIMIZATION_ENABLED: bool = True
+
+    # Itinerary result cache
+    ITINERARY_CACHE_ENABLED: bool = True
+    ITINERARY_CACHE_TTL: int = 86400
+    ITINERARY_CACHE_MAX_BYTES: int = 16_000_000
+
+    # Trip generation job queue
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_MAX_SIZE: int = 200
+    JOB_HEARTBEAT_SECONDS: float = 15.0
+    JOB_STALE_SECONDS: int = 60  # no heartbeat for this long = worker gone
+    JOB_REAPER_INTERVAL_SECONDS: float = 30.0
+
+    # Operator token for /debug/profile and /health/stats; empty disables both entirely
+    PROFILER_ADMIN_TOKEN: str = ""
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_INTERVAL: float = 0.001
+    PROFILE_DIR: str = "profiles"
+    PROFILE_MAX_FILES: int = 50
+
     # CORS
     BACKEND_CORS_ORIGINS: str = "http://localhost:3000"
 
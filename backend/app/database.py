@@ -11,8 +11,11 @@ async def connect_db():
     db = client[settings.MONGODB_DB_NAME]
     # Create indexes
     await db.users.create_index("email", unique=True)
-    await db.trips.create_index("user_id")
-    await db.trips.create_index("created_at")
+    # Trip history is listed newest-first per user with keyset pagination
+    await db.trips.create_index([("user_id", 1), ("created_at", -1), ("_id", -1)])
+    await db.place_cache.create_index("expires_at", expireAfterSeconds=0)
+    await db.itinerary_cache.create_index("expires_at", expireAfterSeconds=0)
+    await db.trip_jobs.create_index([("status", 1), ("created_at", 1)])
     print(f"✅ Connected to MongoDB: {settings.MONGODB_DB_NAME}")
 
 
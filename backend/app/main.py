@@ -1,18 +1,41 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.routers import trips, places, auth, health
+from app.routers import trips, places, auth, health, metrics, debug
 from app.database import connect_db, close_db
+from app.services.http_client import start_http_client, close_http_client
+from app.services.persistent_cache import init_persistent_cache, close_persistent_cache
+from app.services.places_service import seed_autocomplete_index, PlacesUnavailableError
+from app.services.job_queue import start_job_workers, stop_job_workers
+from app.services.ai_service import init_llm
+from app.services.auth_service import close_password_hasher
+from app.services.metrics import start_loop_monitor, stop_loop_monitor
+from app.services.profiler import ProfilerMiddleware, configure_sampling
+from app.services.circuit_breaker import StaleDataMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_db()
+    await start_http_client()
+    await init_persistent_cache()
+    await seed_autocomplete_index()
+    await init_llm(warm_up=settings.GEMINI_WARMUP)
+    await start_job_workers()
+    start_loop_monitor()
+    if settings.PROFILER_ADMIN_TOKEN and settings.PROFILE_SAMPLE_RATE:
+        configure_sampling(settings.PROFILE_SAMPLE_RATE)
     yield
     # Shutdown
+    await stop_loop_monitor()
+    await stop_job_workers()
+    await close_persistent_cache()
+    await close_http_client()
+    close_password_hasher()
     await close_db()
 
 
@@ -21,6 +44,7 @@ app = FastAPI(
     description="AI-Powered Travel Planner using Gemini 2.5 Flash & Google Places",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS
@@ -30,10 +54,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Profile-Id", "X-Stale-Data"],
 )
 
+# Flags responses built from circuit-breaker fallback data
+app.add_middleware(StaleDataMiddleware)
+
+# Request profiling is only wired in when an admin token is configured
+if settings.PROFILER_ADMIN_TOKEN:
+    app.add_middleware(ProfilerMiddleware)
+
+# Google over quota or down: tell clients to retry instead of answering without place data
+@app.exception_handler(PlacesUnavailableError)
+async def places_unavailable(request, exc: PlacesUnavailableError):
+    return ORJSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(settings.CIRCUIT_OPEN_SECONDS))},
+    )
+
+
 # Routers
 app.include_router(health.router, tags=["Health"])
+app.include_router(metrics.router, tags=["Health"])
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(trips.router, prefix="/api/trips", tags=["Trips"])
 app.include_router(places.router, prefix="/api/places", tags=["Places"])
+if settings.PROFILER_ADMIN_TOKEN:
+    app.include_router(debug.router, prefix="/debug", tags=["Debug"])
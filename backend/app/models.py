@@ -112,6 +112,33 @@ class TripResponse(BaseModel):
     created_at: datetime
 
 
+class TripSummary(BaseModel):
+    id: str
+    user_id: Optional[str] = None
+    destination: str
+    summary: Optional[str] = ""
+    total_days: int
+    start_date: str
+    end_date: str
+    travelers: int = 1
+    created_at: datetime
+
+
+class TripSummaryPage(BaseModel):
+    items: List[TripSummary]
+    next_cursor: Optional[str] = None
+
+
+class TripJobResponse(BaseModel):
+    id: str
+    status: str
+    trip_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    access_token: Optional[str] = None  # anonymous jobs only, returned once at submit
+
+
 class PlaceSearchRequest(BaseModel):
     query: str
     location: Optional[str] = None
@@ -119,6 +146,28 @@ class PlaceSearchRequest(BaseModel):
     type: Optional[str] = None
 
 
+class DistanceMatrixRequest(BaseModel):
+    origins: List[str] = Field(..., min_length=1, max_length=200)
+    destinations: List[str] = Field(..., min_length=1, max_length=200)
+    mode: str = "driving"
+
+
+class DayRouteRequest(BaseModel):
+    stops: Optional[List[str]] = Field(default=None, max_length=100)
+    trip_id: Optional[str] = None
+    day: Optional[int] = Field(default=None, ge=1)
+    mode: str = "driving"
+
+
+class GeocodeBatchRequest(BaseModel):
+    addresses: List[str] = Field(..., min_length=1, max_length=100)
+
+
+class ProfileSamplingRequest(BaseModel):
+    sample_rate: float = Field(..., ge=0, le=1)
+    path_prefix: Optional[str] = None
+
+
 class AutocompleteRequest(BaseModel):
     input: str
     types: Optional[str] = "(cities)"
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, status
 from datetime import datetime, timezone
 
 from app.models import UserCreate, UserLogin, UserResponse, TokenResponse
-from app.services.auth_service import hash_password, verify_password, create_access_token
+from app.services.auth_service import hash_password, verify_password, create_access_token, invalidate_user
 from app.database import get_db
 
 router = APIRouter()
@@ -25,15 +25,16 @@ async def register(user_data: UserCreate):
     user_doc = {
         "name": user_data.name,
         "email": user_data.email,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await hash_password(user_data.password),
         "created_at": datetime.now(timezone.utc),
     }
 
     result = await db.users.insert_one(user_doc)
     user_doc["_id"] = result.inserted_id
+    invalidate_user(user_data.email)
 
     # Generate token
-    token = create_access_token({"sub": user_data.email, "name": user_data.name})
+    token = create_access_token({"sub": user_data.email, "name": user_data.name, "uid": str(result.inserted_id)})
 
     return TokenResponse(
         access_token=token,
@@ -52,13 +53,19 @@ async def login(credentials: UserLogin):
     db = get_db()
 
     user = await db.users.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+    valid, new_hash = await verify_password(credentials.password, user["password_hash"]) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    token = create_access_token({"sub": user["email"], "name": user["name"]})
+    # Stored hash predates the current BCRYPT_ROUNDS: upgrade it now that we know the password
+    if new_hash:
+        await db.users.update_one({"_id": user["_id"]}, {"$set": {"password_hash": new_hash}})
+        invalidate_user(user["email"])
+
+    token = create_access_token({"sub": user["email"], "name": user["name"], "uid": str(user["_id"])})
 
     return TokenResponse(
         access_token=token,
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.models import ProfileSamplingRequest
+from app.services.auth_service import require_admin
+from app.services.profiler import configure_sampling, list_profiles, profile_path, profiler_stats
+
+router = APIRouter()
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+async def profiling_status():
+    """Current sampling settings and the stored profiles, newest first."""
+    return {**profiler_stats(), "profiles": list_profiles()}
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def set_profiling(request: ProfileSamplingRequest):
+    """Profile a fraction of live requests (0 turns sampling off)."""
+    configure_sampling(request.sample_rate, request.path_prefix)
+    return profiler_stats()
+
+
+@router.delete("/profile", dependencies=[Depends(require_admin)])
+async def stop_profiling():
+    configure_sampling(0.0)
+    return profiler_stats()
+
+
+@router.get("/profile/{name}", dependencies=[Depends(require_admin)])
+async def download_profile(name: str):
+    """Speedscope JSON for one request; open it at https://www.speedscope.app."""
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=name)
@@ -1,4 +1,17 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.services.ai_service import llm_stats
+from app.services.auth_service import auth_cache_stats, require_admin
+from app.services.circuit_breaker import circuit_stats
+from app.services.http_client import pool_stats
+from app.services.itinerary_cache import itinerary_cache_stats
+from app.services.job_queue import job_queue_stats
+from app.services.maps_service import distance_matrix_stats, route_stats, geocode_stats
+from app.services.outbound_scheduler import scheduler_stats
+from app.services.persistent_cache import persistent_cache_stats
+from app.services.places_service import place_cache_stats, geo_index_stats, autocomplete_stats
+from app.services.profiler import profiler_stats
+from app.services.singleflight import singleflight_stats
 
 router = APIRouter()
 
@@ -6,3 +19,26 @@ router = APIRouter()
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "TripStellar API", "version": "1.0.0"}
+
+
+@router.get("/health/stats", dependencies=[Depends(require_admin)])
+async def health_stats():
+    """Runtime stats for outbound calls and caches (operators only: X-Admin-Token)."""
+    return {
+        "http_pool": pool_stats(),
+        "outbound_scheduler": scheduler_stats(),
+        "circuit_breakers": circuit_stats(),
+        "singleflight": singleflight_stats(),
+        "place_cache": place_cache_stats(),
+        "place_store": persistent_cache_stats(),
+        "geo_index": geo_index_stats(),
+        "autocomplete": autocomplete_stats(),
+        "distance_matrix": distance_matrix_stats(),
+        "routes": route_stats(),
+        "geocode": geocode_stats(),
+        "itinerary_cache": itinerary_cache_stats(),
+        "job_queue": job_queue_stats(),
+        "auth": auth_cache_stats(),
+        "llm": llm_stats(),
+        "profiler": profiler_stats(),
+    }
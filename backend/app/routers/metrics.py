@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from typing import Dict, Tuple
+
+from app.services.auth_service import auth_cache_stats
+from app.services.itinerary_cache import itinerary_cache_stats
+from app.services.maps_service import distance_matrix_stats, route_stats, geocode_stats
+from app.services.persistent_cache import persistent_cache_stats
+from app.services.places_service import place_cache_stats, autocomplete_stats
+
+router = APIRouter()
+
+
+def _cache_counters() -> Dict[str, Tuple[int, int]]:
+    """(hits, misses) for every cache, read from the services' own stats."""
+    counters = {
+        f"place_cache:{namespace}": (stats["hits"], stats["misses"])
+        for namespace, stats in place_cache_stats().items()
+    }
+    store = persistent_cache_stats()
+    counters["place_store"] = (store["hits"] + store["stale_hits"], store["misses"])
+    itinerary = itinerary_cache_stats()
+    counters["itinerary"] = (itinerary["hits"], itinerary["misses"])
+    autocomplete = autocomplete_stats()
+    counters["autocomplete"] = (
+        autocomplete["cache_hits"] + autocomplete["local_hits"] + autocomplete["prefix_reuse"],
+        autocomplete["upstream"],
+    )
+    for name, stats in (
+        ("distance_matrix", distance_matrix_stats()["cache"]),
+        ("route_legs", route_stats()["cache"]),
+        ("geocode", geocode_stats()["cache"]),
+        ("auth_tokens", auth_cache_stats()["tokens"]),
+        ("auth_users", auth_cache_stats()["users"]),
+    ):
+        counters[name] = (stats["hits"], stats["misses"])
+    return counters
+
+
+class _CacheCollector:
+    """Exposes cache hit/miss counters and hit ratios at scrape time."""
+
+    def collect(self):
+        hits = CounterMetricFamily("tripstellar_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("tripstellar_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("tripstellar_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        for cache, (hit_count, miss_count) in _cache_counters().items():
+            hits.add_metric([cache], hit_count)
+            misses.add_metric([cache], miss_count)
+            total = hit_count + miss_count
+            ratio.add_metric([cache], hit_count / total if total else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+
+REGISTRY.register(_CacheCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition of stage/outbound latency histograms, cache ratios and loop lag."""
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
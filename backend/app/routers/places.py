@@ -1,19 +1,37 @@
-from fastapi import APIRouter, Query
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Dict, Any, Optional
 
-from app.models import PlaceInfo
+from app.config import settings
+from app.models import PlaceInfo, DistanceMatrixRequest, DayRouteRequest, GeocodeBatchRequest
 from app.services.places_service import (
     search_places,
     get_place_details,
     autocomplete_places,
+    search_nearby,
     get_top_restaurants,
     get_top_attractions,
 )
-from app.services.maps_service import get_directions, geocode
+from app.services.maps_service import (
+    get_directions,
+    get_day_route,
+    get_distance_matrix,
+    geocode,
+    geocode_many,
+    place_to_stop,
+)
+from app.services.route_optimizer import parse_clock
+from app.services.trip_service import get_trip_day
+from app.services.auth_service import get_current_user
 
 router = APIRouter()
 
 
+def _limit_anonymous(user, count: int, limit: int, what: str):
+    """Billable fan-out cap for anonymous callers: above `limit` they must sign in."""
+    if not user and count > limit:
+        raise HTTPException(status_code=401, detail=f"Sign in to request more than {limit} {what}")
+
+
 @router.get("/autocomplete")
 async def place_autocomplete(
     input: str = Query(..., min_length=2),
@@ -39,12 +57,30 @@ async def search(
     )
 
 
+@router.get("/nearby", response_model=List[PlaceInfo])
+async def nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(default=2.0, gt=0, le=50),
+    type: Optional[str] = Query(default=None),
+    min_rating: float = Query(default=4.0, ge=0, le=5),
+    max_results: int = Query(default=10, ge=1, le=20),
+) -> List[PlaceInfo]:
+    """Top-rated places within radius_km of a point, served from the local geo index when possible."""
+    return await search_nearby(lat, lng, radius_km, type, min_rating, max_results)
+
+
 @router.get("/restaurants")
 async def top_restaurants(
     destination: str = Query(..., min_length=2),
     max_results: int = Query(default=8, ge=1, le=20),
+    lat: Optional[float] = Query(default=None, ge=-90, le=90),
+    lng: Optional[float] = Query(default=None, ge=-180, le=180),
+    radius_km: float = Query(default=5.0, gt=0, le=50),
 ) -> List[PlaceInfo]:
-    """Get top-rated restaurants at a destination."""
+    """Get top-rated restaurants at a destination (or near lat/lng when given)."""
+    if lat is not None and lng is not None:
+        return await search_nearby(lat, lng, radius_km, "restaurant", 4.0, max_results)
     return await get_top_restaurants(destination, max_results)
 
 
@@ -52,8 +88,13 @@ async def top_restaurants(
 async def top_attractions(
     destination: str = Query(..., min_length=2),
     max_results: int = Query(default=10, ge=1, le=20),
+    lat: Optional[float] = Query(default=None, ge=-90, le=90),
+    lng: Optional[float] = Query(default=None, ge=-180, le=180),
+    radius_km: float = Query(default=5.0, gt=0, le=50),
 ) -> List[PlaceInfo]:
-    """Get top-rated tourist attractions at a destination."""
+    """Get top-rated tourist attractions at a destination (or near lat/lng when given)."""
+    if lat is not None and lng is not None:
+        return await search_nearby(lat, lng, radius_km, "tourist_attraction", 4.0, max_results)
     return await get_top_attractions(destination, max_results)
 
 
@@ -79,6 +120,54 @@ async def directions(
     return result
 
 
+@router.post("/directions/day")
+async def day_directions(body: DayRouteRequest, user=Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Route through a whole day's stops (given directly, or a trip id + day number) in one call.
+    A stored day is routed through its activities and meals in time order. Long
+    routes take several Directions calls, so anonymous callers are limited to
+    DAY_ROUTE_ANON_MAX_STOPS stops.
+    """
+    stops = body.stops
+    if stops is None:
+        if not body.trip_id or body.day is None:
+            raise HTTPException(status_code=400, detail="Provide stops, or trip_id and day")
+        day = await get_trip_day(body.trip_id, body.day)
+        if day is None:
+            raise HTTPException(status_code=404, detail="Trip day not found")
+        visits = [*(day.get("activities") or []), *(day.get("meals") or [])]
+        # Stable sort: unparseable times go last, in their original order
+        visits.sort(key=lambda v: t if (t := parse_clock(v.get("time"))) is not None else 24 * 60)
+        stops = [stop for v in visits if (stop := place_to_stop(v.get("place")))]
+    _limit_anonymous(user, len(stops), settings.DAY_ROUTE_ANON_MAX_STOPS, "stops")
+
+    if len(stops) < 2:
+        return {"error": "At least two stops are needed for a route"}
+    result = await get_day_route(stops, body.mode)
+    if not result:
+        return {"error": "Could not find directions"}
+    return result
+
+
+@router.post("/distance-matrix")
+async def distance_matrix(body: DistanceMatrixRequest, user=Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Travel distances/durations for every origin x destination pair, in one call.
+    Every element is billed by Google, so anonymous callers get a small matrix
+    (DISTANCE_MATRIX_ANON_MAX_ELEMENTS) and signed-in users a larger one.
+    """
+    elements = len(body.origins) * len(body.destinations)
+    _limit_anonymous(user, elements, settings.DISTANCE_MATRIX_ANON_MAX_ELEMENTS, "origin x destination pairs")
+    limit = settings.DISTANCE_MATRIX_MAX_ELEMENTS
+    if elements > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} origin x destination pairs per request")
+
+    result = await get_distance_matrix(body.origins, body.destinations, body.mode)
+    if not result:
+        return {"error": "Could not compute distance matrix"}
+    return result
+
+
 @router.get("/geocode")
 async def geocode_address(address: str = Query(...)) -> Dict[str, Any]:
     """Geocode an address to lat/lng."""
@@ -86,3 +175,20 @@ async def geocode_address(address: str = Query(...)) -> Dict[str, Any]:
     if not result:
         return {"error": "Could not geocode address"}
     return result
+
+
+@router.post("/geocode/batch")
+async def geocode_batch(body: GeocodeBatchRequest, user=Depends(get_current_user)) -> Dict[str, Any]:
+    """
+    Geocode many addresses at once; each result is a location or an error.
+    Each address may be a billed Geocoding call, so anonymous callers are
+    limited to GEOCODE_BATCH_ANON_MAX_ADDRESSES.
+    """
+    _limit_anonymous(user, len(body.addresses), settings.GEOCODE_BATCH_ANON_MAX_ADDRESSES, "addresses")
+    locations = await geocode_many(body.addresses)
+    return {
+        "results": [
+            {"address": address, **location} if location else {"address": address, "error": "Could not geocode address"}
+            for address, location in zip(body.addresses, locations)
+        ]
+    }
@@ -1,46 +1,85 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from datetime import datetime, timezone
+import hmac
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from typing import List, Optional
 from bson import ObjectId
 
-from app.models import TripRequest, TripResponse, TripItinerary
-from app.services.ai_service import generate_trip_itinerary
-from app.services.auth_service import get_current_user
+from app.models import TripRequest, TripResponse, TripJobResponse, TripSummaryPage
+from app.services.ai_service import generate_trip_itinerary, stream_trip_itinerary
+from app.services.auth_service import get_current_user, get_current_user_readonly
+from app.services.places_service import PlacesUnavailableError
+from app.services.trip_service import save_trip, list_trips, trip_document, trip_summary, SUMMARY_PROJECTION
+from app.services.job_queue import (
+    QueueFullError,
+    TERMINAL_STATUSES,
+    submit_job,
+    get_job,
+    wait_for_change,
+)
 from app.database import get_db
 
 router = APIRouter()
 
 
+def _user_id(user) -> Optional[str]:
+    return str(user["_id"]) if user else None
+
+
+def _job_response(job, include_token: bool = False) -> TripJobResponse:
+    return TripJobResponse(
+        id=str(job["_id"]),
+        status=job["status"],
+        trip_id=job.get("trip_id"),
+        error=job.get("error"),
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        access_token=job.get("access_token") if include_token else None,
+    )
+
+
+def _sse(event: str, data: str) -> str:
+    """Format one Server-Sent Events message (data is already JSON)."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
 @router.post("/generate", response_model=TripResponse, status_code=status.HTTP_201_CREATED)
-async def generate_trip(trip_request: TripRequest, user=Depends(get_current_user)):
+async def generate_trip(
+    trip_request: TripRequest,
+    no_cache: bool = Query(default=False, description="Skip the itinerary result cache"),
+    mode: str = Query(default="sync", pattern="^(sync|job)$",
+                      description="`job` queues generation and returns a job id immediately"),
+    user=Depends(get_current_user),
+):
     """
     Generate an AI-powered travel itinerary.
     Fetches real data from Google Places API, then uses Gemini 2.5 Flash
     via LangChain to create a personalized day-by-day plan.
+
+    With `mode=job` the request is queued and answered with 202 and a
+    TripJobResponse; poll `/jobs/{job_id}` or subscribe to `/jobs/{job_id}/events`.
+    Anonymous callers must pass the returned `access_token` as `?token=` there.
     """
+    if mode == "job":
+        try:
+            job = await submit_job(trip_request, _user_id(user), use_cache=not no_cache)
+        except QueueFullError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=_job_response(job, include_token=True).model_dump(mode="json"),
+        )
+
     try:
         # Generate itinerary using AI + real Places data
-        itinerary = await generate_trip_itinerary(trip_request)
-
-        # Save to database
-        db = get_db()
-        trip_doc = {
-            "user_id": str(user["_id"]) if user else None,
-            "request": trip_request.model_dump(),
-            "itinerary": itinerary.model_dump(),
-            "created_at": datetime.now(timezone.utc),
-        }
-
-        result = await db.trips.insert_one(trip_doc)
-
-        return TripResponse(
-            id=str(result.inserted_id),
-            user_id=trip_doc["user_id"],
-            request=trip_request,
-            itinerary=itinerary,
-            created_at=trip_doc["created_at"],
-        )
+        itinerary = await generate_trip_itinerary(trip_request, use_cache=not no_cache)
+
+        # Save to database; the model was just validated, so encode it directly
+        trip = await save_trip(trip_request, itinerary, _user_id(user))
+        return ORJSONResponse(status_code=status.HTTP_201_CREATED, content=trip.model_dump())
 
+    except PlacesUnavailableError:
+        raise  # 503 with Retry-After, see main.py
     except Exception as e:
         print(f"Error generating trip: {e}")
         raise HTTPException(
@@ -49,32 +88,133 @@ async def generate_trip(trip_request: TripRequest, user=Depends(get_current_user
         )
 
 
+@router.post("/generate/stream")
+async def generate_trip_stream(
+    trip_request: TripRequest,
+    no_cache: bool = Query(default=False, description="Skip the itinerary result cache"),
+    user=Depends(get_current_user),
+):
+    """
+    Generate an itinerary as a Server-Sent Events stream.
+    Emits a `header` event with the trip overview, a `day` event per DayPlan
+    as soon as it is complete, then `complete` with the saved TripResponse
+    (or `error` if generation fails).
+    """
+
+    async def events():
+        try:
+            async for event, data in stream_trip_itinerary(trip_request, use_cache=not no_cache):
+                if event == "itinerary":
+                    trip = await save_trip(trip_request, data, _user_id(user))
+                    yield _sse("complete", trip.model_dump_json())
+                else:
+                    yield _sse(event, json.dumps(data, default=str))
+        except PlacesUnavailableError as e:
+            print(f"Error streaming trip: {e}")
+            yield _sse("error", json.dumps({"detail": str(e), "retryable": True}))
+        except Exception as e:
+            print(f"Error streaming trip: {e}")
+            yield _sse("error", json.dumps({"detail": f"Failed to generate itinerary: {str(e)}"}))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _can_read_job(job, user, token: Optional[str]) -> bool:
+    """Signed-in jobs belong to their user; anonymous ones to whoever holds the submit-time token."""
+    if job.get("user_id"):
+        return job["user_id"] == _user_id(user)
+    expected = job.get("access_token")
+    return bool(expected and token) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+async def _get_owned_job(job_id: str, user, token: Optional[str]):
+    job = await get_job(job_id)
+    if not job or not _can_read_job(job, user, token):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=TripJobResponse)
+async def get_trip_job(
+    job_id: str,
+    token: Optional[str] = Query(default=None, description="access_token of an anonymous job"),
+    user=Depends(get_current_user_readonly),
+):
+    """Get the status of a queued trip generation job."""
+    return _job_response(await _get_owned_job(job_id, user, token))
+
+
+@router.get("/jobs/{job_id}/events")
+async def trip_job_events(
+    job_id: str,
+    token: Optional[str] = Query(default=None, description="access_token of an anonymous job"),
+    user=Depends(get_current_user_readonly),
+):
+    """Server-Sent Events stream of job status changes, ending when the job finishes."""
+    job = await _get_owned_job(job_id, user, token)
+
+    async def events():
+        current = job
+        last_status = None
+        while True:
+            if current["status"] != last_status:
+                last_status = current["status"]
+                yield _sse("status", _job_response(current).model_dump_json())
+            if current["status"] in TERMINAL_STATUSES:
+                return
+            await wait_for_change(job_id, timeout=2.0)
+            current = await get_job(job_id) or current
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/", response_model=List[TripResponse])
-async def get_user_trips(user=Depends(get_current_user)):
-    """Get all trips for the authenticated user."""
+async def get_user_trips(
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    user=Depends(get_current_user_readonly),
+):
+    """Get the authenticated user's trips with full itineraries (next page cursor in X-Next-Cursor)."""
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
 
-    db = get_db()
-    cursor = db.trips.find({"user_id": str(user["_id"])}).sort("created_at", -1).limit(50)
-    trips = []
-
-    async for doc in cursor:
-        trips.append(
-            TripResponse(
-                id=str(doc["_id"]),
-                user_id=doc.get("user_id"),
-                request=TripRequest(**doc["request"]),
-                itinerary=TripItinerary(**doc["itinerary"]),
-                created_at=doc["created_at"],
-            )
-        )
+    try:
+        docs, next_cursor = await list_trips(_user_id(user), limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    return trips
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return ORJSONResponse(content=[trip_document(doc) for doc in docs], headers=headers)
+
+
+@router.get("/summary", response_model=TripSummaryPage)
+async def get_user_trip_summaries(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None),
+    user=Depends(get_current_user_readonly),
+):
+    """Trip history headers only (no days); fetch /{trip_id} for a full itinerary."""
+    if not user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    try:
+        docs, next_cursor = await list_trips(_user_id(user), limit, cursor, SUMMARY_PROJECTION)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return TripSummaryPage(items=[trip_summary(doc) for doc in docs], next_cursor=next_cursor)
 
 
 @router.get("/{trip_id}", response_model=TripResponse)
-async def get_trip(trip_id: str, user=Depends(get_current_user)):
+async def get_trip(trip_id: str, user=Depends(get_current_user_readonly)):
     """Get a specific trip by ID."""
     db = get_db()
 
@@ -86,13 +226,7 @@ async def get_trip(trip_id: str, user=Depends(get_current_user)):
     if not doc:
         raise HTTPException(status_code=404, detail="Trip not found")
 
-    return TripResponse(
-        id=str(doc["_id"]),
-        user_id=doc.get("user_id"),
-        request=TripRequest(**doc["request"]),
-        itinerary=TripItinerary(**doc["itinerary"]),
-        created_at=doc["created_at"],
-    )
+    return ORJSONResponse(content=trip_document(doc))
 
 
 @router.delete("/{trip_id}", status_code=status.HTTP_204_NO_CONTENT)
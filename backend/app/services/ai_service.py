@@ -4,33 +4,104 @@ Uses LangChain as orchestrator with Gemini 2.5 Flash from Vertex AI
 to generate personalized travel itineraries.
 """
 
+import asyncio
 import json
-from typing import Dict, Any, List
-from datetime import datetime
+import time
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+from datetime import datetime, timedelta
+
+from pydantic import ValidationError
 
 from langchain_google_vertexai import ChatVertexAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.runnables import Runnable
+from langchain_core.utils.json import parse_json_markdown
 
 from app.config import settings
-from app.models import TripRequest, TripItinerary
+from app.models import TripRequest, TripItinerary, DayPlan
+from app.services import itinerary_cache
+from app.services.circuit_breaker import track_stale
+from app.services.json_stream import ItineraryStreamParser
+from app.services.metrics import LLM_IN_FLIGHT, observe_prompt_tokens, time_stage, time_stage_iter
 from app.services.places_service import get_destination_data
+from app.services.route_optimizer import optimize_day, optimize_itinerary_routes
+
+# One model client and one compiled chain per prompt, shared by every request
+_llm = None
+_chains: Dict[str, Runnable] = {}
+_setup_stats: Dict[str, float] = {}
+_prompt_stats: Dict[str, int] = {
+    "requests": 0, "last_input_tokens": 0, "last_places_tokens": 0, "total_input_tokens": 0,
+}
 
 
 def _get_llm():
-    """Initialize Gemini 2.5 Flash via Vertex AI."""
-    return ChatVertexAI(
-        model="gemini-2.5-flash-preview-04-17",
-        project=settings.GCP_PROJECT_ID,
-        location=settings.GCP_LOCATION,
-        temperature=0.7,
-        max_output_tokens=8192,
-        top_p=0.95,
+    """Initialize Gemini 2.5 Flash via Vertex AI (once per process)."""
+    global _llm
+    if _llm is None:
+        started = time.perf_counter()
+        _llm = ChatVertexAI(
+            model=settings.GEMINI_MODEL,
+            project=settings.GCP_PROJECT_ID,
+            location=settings.GCP_LOCATION,
+            temperature=settings.GEMINI_TEMPERATURE,
+            max_output_tokens=settings.GEMINI_MAX_OUTPUT_TOKENS,
+            top_p=settings.GEMINI_TOP_P,
+        )
+        _setup_stats["llm_init_seconds"] = round(time.perf_counter() - started, 6)
+    return _llm
+
+
+def _get_chain(name: str) -> Runnable:
+    """Return the compiled prompt | llm | parser chain for name, building it once."""
+    chain = _chains.get(name)
+    if chain is None:
+        started = time.perf_counter()
+        prompt, parser = _CHAIN_SPECS[name]
+        chain = prompt | _get_llm() | parser()
+        _chains[name] = chain
+        _setup_stats[f"chain_build_seconds.{name}"] = round(time.perf_counter() - started, 6)
+    return chain
+
+
+async def init_llm(warm_up: bool = False):
+    """Build the shared client and chains at startup, optionally warming the connection."""
+    try:
+        for name in _CHAIN_SPECS:
+            _get_chain(name)
+        setup_seconds = sum(v for k, v in _setup_stats.items() if not k.startswith("warmup"))
+        print(f"🤖 Gemini client ready: {settings.GEMINI_MODEL} (setup {setup_seconds * 1000:.1f} ms)")
+
+        if warm_up:
+            started = time.perf_counter()
+            await _get_llm().ainvoke("Reply with OK.")
+            _setup_stats["warmup_seconds"] = round(time.perf_counter() - started, 6)
+            print(f"🔥 Gemini warm-up call took {_setup_stats['warmup_seconds'] * 1000:.0f} ms")
+    except Exception as e:
+        # Don't block startup on credentials or network; requests will retry lazily
+        print(f"⚠️  Gemini client init failed: {e}")
+
+
+def llm_stats() -> Dict[str, Any]:
+    """
+    One-time setup cost of the shared client and chains. Before they were
+    shared, llm_init_seconds plus the chain build time was paid per request.
+    """
+    per_request = _setup_stats.get("llm_init_seconds", 0.0) + _setup_stats.get(
+        "chain_build_seconds.itinerary_stream", 0.0
     )
+    return {
+        "model": settings.GEMINI_MODEL,
+        "initialized": _llm is not None,
+        "chains": sorted(_chains),
+        "saved_per_request_seconds": round(per_request, 6),
+        **_setup_stats,
+        "prompt": dict(_prompt_stats),
+    }
 
 
-TRIP_PLANNER_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", """You are TripStellar AI, an expert travel planner. You create detailed,
+TRIP_PLANNER_SYSTEM = """You are TripStellar AI, an expert travel planner. You create detailed,
 personalized travel itineraries using real place data provided to you.
 
 IMPORTANT RULES:
@@ -40,10 +111,9 @@ IMPORTANT RULES:
 4. Match the travel style and budget preferences of the traveler.
 5. Include local tips, cultural notes, and money-saving advice.
 6. Always respond with valid JSON matching the exact schema specified.
-"""),
-    ("human", """Plan a trip with the following details:
+"""
 
-**Destination:** {destination}
+TRIP_DETAILS_BLOCK = """**Destination:** {destination}
 **Dates:** {start_date} to {end_date} ({total_days} days)
 **Travelers:** {travelers} person(s)
 **Budget Level:** {budget}
@@ -51,7 +121,8 @@ IMPORTANT RULES:
 **Interests:** {interests}
 **Special Requirements:** {special_requirements}
 
-**REAL DATA FROM GOOGLE PLACES API:**
+**REAL DATA FROM GOOGLE PLACES API** (one place per row; columns are named in each header row;
+ids are for reference only — use the place's real name in your answer):
 
 Top-Rated Restaurants:
 {restaurants_data}
@@ -62,81 +133,38 @@ Top Tourist Attractions:
 Hotels:
 {hotels_data}
 
----
+"""
 
-Generate a complete travel itinerary as JSON with this EXACT structure:
-{{
-    "destination": "string - destination name",
-    "summary": "string - 2-3 sentence trip summary",
-    "total_days": number,
-    "best_time_to_visit": "string",
-    "currency": "string - local currency",
-    "language": "string - primary language",
-    "travel_tips": ["string array of 5-8 travel tips"],
-    "packing_list": ["string array of 8-12 packing items"],
-    "estimated_total_budget": "string - total estimated cost",
-    "emergency_contacts": {{"police": "number", "ambulance": "number", "tourist_helpline": "number"}},
-    "days": [
-        {{
-            "day": 1,
-            "date": "YYYY-MM-DD",
-            "theme": "string - theme for the day",
-            "activities": [
-                {{
-                    "time": "09:00 AM",
-                    "title": "string",
-                    "description": "string - detailed description",
-                    "duration": "string - e.g. 2 hours",
-                    "place": {{
-                        "name": "string - actual place name from data",
-                        "address": "string",
-                        "rating": number,
-                        "latitude": number,
-                        "longitude": number
-                    }},
-                    "tips": "string - insider tip",
-                    "estimated_cost": "string"
-                }}
-            ],
-            "meals": [
-                {{
-                    "time": "12:30 PM",
-                    "title": "Lunch at [Restaurant Name]",
-                    "description": "string",
-                    "place": {{
-                        "name": "string - actual restaurant name from data",
-                        "address": "string",
-                        "rating": number,
-                        "latitude": number,
-                        "longitude": number
-                    }},
-                    "estimated_cost": "string"
-                }}
-            ],
-            "accommodation_tip": "string"
-        }}
-    ],
-    "top_restaurants": [
-        {{
-            "name": "string",
-            "address": "string",
-            "rating": number,
-            "total_ratings": number,
-            "latitude": number,
-            "longitude": number
-        }}
-    ],
-    "top_attractions": [
-        {{
-            "name": "string",
-            "address": "string",
-            "rating": number,
-            "total_ratings": number,
-            "latitude": number,
-            "longitude": number
-        }}
-    ]
-}}
+# Compact schema notation: str = string, num = number, [x] = array of x
+PLACE_SCHEMA = '{{"name":str (exact name from the data),"address":str,"rating":num,"latitude":num,"longitude":num}}'
+
+DAY_SCHEMA_BLOCK = (
+    '{{"day":num,"date":"YYYY-MM-DD","theme":str,'
+    '"activities":[{{"time":"09:00 AM","title":str,"description":str,"duration":"e.g. 2 hours",'
+    '"place":' + PLACE_SCHEMA + ',"tips":str (insider tip),"estimated_cost":str}}],'
+    '"meals":[{{"time":"12:30 PM","title":"Lunch at <restaurant>","description":str,'
+    '"place":' + PLACE_SCHEMA + ',"estimated_cost":str}}],'
+    '"accommodation_tip":str}}'
+)
+
+TRIP_HEADER_SCHEMA = (
+    '"destination":str,"summary":str (2-3 sentences),"total_days":num,"best_time_to_visit":str,'
+    '"currency":str (local currency),"language":str (primary language),'
+    '"travel_tips":[str] (5-8 tips),"packing_list":[str] (8-12 items),'
+    '"estimated_total_budget":str (total estimated cost),'
+    '"emergency_contacts":{{"police":str,"ambulance":str,"tourist_helpline":str}}'
+)
+
+
+TRIP_PLANNER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", TRIP_PLANNER_SYSTEM),
+    ("human", """Plan a trip with the following details:
+
+""" + TRIP_DETAILS_BLOCK + """---
+
+Generate a complete travel itinerary as JSON with this EXACT structure
+(str = string, num = number, [x] = array of x):
+{{""" + TRIP_HEADER_SCHEMA + ""","days":[""" + DAY_SCHEMA_BLOCK + """]}}
 
 Use the REAL place data provided above. Include 3-5 activities and 2-3 meals per day.
 Respond with ONLY the JSON, no markdown formatting or code blocks.
@@ -144,81 +172,398 @@ Respond with ONLY the JSON, no markdown formatting or code blocks.
 ])
 
 
-def _format_places_for_prompt(places: List[Dict[str, Any]]) -> str:
-    """Format place data into a readable string for the LLM."""
+# ── Chunked generation (long trips) ──
+# A short skeleton call fixes the shared fields and a theme per day, then the
+# days are generated in windows concurrently and stitched together.
+
+TRIP_SKELETON_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", TRIP_PLANNER_SYSTEM),
+    ("human", """Plan the outline of a trip with the following details:
+
+""" + TRIP_DETAILS_BLOCK + """---
+
+Do NOT plan individual activities yet. Generate the trip overview as JSON with this EXACT structure
+(str = string, num = number, [x] = array of x):
+{{""" + TRIP_HEADER_SCHEMA + ""","day_themes":[{{"day":num,"theme":str (naming the area or main sights)}}]}}
+
+Include exactly one entry in "day_themes" per day, spreading the attractions across the trip
+without repeating them. Respond with ONLY the JSON, no markdown formatting or code blocks.
+""")
+])
+
+TRIP_DAYS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", TRIP_PLANNER_SYSTEM),
+    ("human", """You are planning part of a trip with the following details:
+
+""" + TRIP_DETAILS_BLOCK + """**Day-by-day outline of the whole trip:**
+{day_outline}
+
+---
+
+Plan ONLY days {day_start} to {day_end}, following their themes from the outline and avoiding
+places that belong to other days. Respond with JSON with this EXACT structure
+(str = string, num = number, [x] = array of x):
+{{"days":[""" + DAY_SCHEMA_BLOCK + """]}}
+
+Include 3-5 activities and 2-3 meals per day.
+Respond with ONLY the JSON, no markdown formatting or code blocks.
+""")
+])
+
+
+_CHAIN_SPECS = {
+    "itinerary_stream": (TRIP_PLANNER_PROMPT, StrOutputParser),
+    "skeleton": (TRIP_SKELETON_PROMPT, JsonOutputParser),
+    "days": (TRIP_DAYS_PROMPT, JsonOutputParser),
+}
+
+# Columns in the order they are dropped when a list is over its token budget. The
+# address is never dropped: the itinerary must quote real addresses, not invented ones.
+_DROPPABLE_COLUMNS = ["types", "reviews", "price"]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _place_row(place_id: str, place: Dict[str, Any], columns: List[str]) -> str:
+    cells = []
+    for column in columns:
+        if column == "id":
+            cells.append(place_id)
+        elif column == "name":
+            cells.append(str(place.get("name") or "Unknown"))
+        elif column == "rating":
+            cells.append(f"{place['rating']:g}" if place.get("rating") else "")
+        elif column == "reviews":
+            cells.append(str(place.get("total_ratings") or ""))
+        elif column == "price":
+            price_level = place.get("price_level")
+            cells.append("$" * (price_level or 1) if price_level is not None else "")
+        elif column == "types":
+            cells.append(",".join(place.get("types", [])[:2]))
+        elif column == "lat,lng":
+            lat, lng = place.get("latitude"), place.get("longitude")
+            cells.append(f"{lat:.4f},{lng:.4f}" if lat is not None and lng is not None else "")
+        elif column == "address":
+            cells.append(str(place.get("address") or ""))
+    return "|".join(cell.replace("|", "/") for cell in cells)
+
+
+def _format_places_for_prompt(
+    places: List[Dict[str, Any]], id_prefix: str = "P", token_budget: int = 0
+) -> Tuple[str, int]:
+    """
+    Format place data as a compact pipe-separated table with short ids and
+    rounded coordinates. If token_budget is set, drop the lowest-value columns
+    first, then the lowest-ranked rows, until the table fits. Returns the text
+    and its estimated token count.
+    """
     if not places:
-        return "No data available"
-
-    lines = []
-    for i, place in enumerate(places, 1):
-        line = f"{i}. {place.get('name', 'Unknown')}"
-        if place.get('rating'):
-            line += f" (Rating: {place['rating']}⭐"
-            if place.get('total_ratings'):
-                line += f", {place['total_ratings']} reviews"
-            line += ")"
-        if place.get('address'):
-            line += f"\n   Address: {place['address']}"
-        if place.get('price_level') is not None:
-            price_str = "$" * (place['price_level'] or 1)
-            line += f"\n   Price: {price_str}"
-        if place.get('types'):
-            line += f"\n   Type: {', '.join(place['types'][:3])}"
-        if place.get('latitude') and place.get('longitude'):
-            line += f"\n   Coords: {place['latitude']}, {place['longitude']}"
-        lines.append(line)
-
-    return "\n".join(lines)
-
-
-async def generate_trip_itinerary(trip_request: TripRequest) -> TripItinerary:
-    """Generate a complete trip itinerary using LangChain + Gemini."""
+        return "No data available", 3
+
+    columns = ["id", "name", "rating", "reviews", "price", "types", "lat,lng", "address"]
+    rows = list(places)
+
+    def render() -> str:
+        lines = ["|".join(columns)]
+        lines += [_place_row(f"{id_prefix}{i}", place, columns) for i, place in enumerate(rows, 1)]
+        return "\n".join(lines)
+
+    text = render()
+    droppable = list(_DROPPABLE_COLUMNS)
+    while token_budget and estimate_tokens(text) > token_budget:
+        if droppable:
+            columns.remove(droppable.pop(0))
+        elif len(rows) > 1:
+            # Places arrive sorted by rating, so the tail is the least valuable
+            rows.pop()
+        else:
+            break
+        text = render()
+
+    return text, estimate_tokens(text)
+
+
+_PROMPT_VERSION = itinerary_cache.prompt_hash(TRIP_PLANNER_PROMPT)
+_CHUNKED_PROMPT_VERSION = itinerary_cache.prompt_hash(TRIP_SKELETON_PROMPT, TRIP_DAYS_PROMPT)
+
+
+def _use_chunked(trip_request: TripRequest) -> bool:
+    """Long trips are generated as a skeleton plus concurrent day windows."""
+    min_days = settings.GENERATION_CHUNK_MIN_DAYS
+    return min_days > 0 and itinerary_cache.trip_total_days(trip_request) >= min_days
+
+
+def _itinerary_cache_key(trip_request: TripRequest) -> str:
+    version = _CHUNKED_PROMPT_VERSION if _use_chunked(trip_request) else _PROMPT_VERSION
+    return itinerary_cache.cache_key(trip_request, version, settings.GEMINI_MODEL)
+
+
+async def _build_prompt_inputs(trip_request: TripRequest) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Fetch destination data and assemble the prompt variables."""
 
     # 1. Fetch real destination data from Google Places API
-    destination_data = await get_destination_data(
-        trip_request.destination,
-        trip_request.budget or "moderate",
-    )
+    with time_stage("places_fetch"):
+        destination_data = await get_destination_data(
+            trip_request.destination,
+            trip_request.budget or "moderate",
+        )
+
+    with time_stage("prompt_format"):
+        # 2. Calculate total days
+        start = datetime.strptime(trip_request.start_date, "%Y-%m-%d")
+        end = datetime.strptime(trip_request.end_date, "%Y-%m-%d")
+        total_days = max((end - start).days + 1, 1)
+
+        # 3. Format data for prompt, splitting the token budget by each list's share of places
+        lists = {
+            "restaurants": ("R", destination_data["restaurants"]),
+            "attractions": ("A", destination_data["attractions"]),
+            "hotels": ("H", destination_data["hotels"]),
+        }
+        total_places = sum(len(places) for _, places in lists.values()) or 1
+        budget = settings.PROMPT_PLACES_TOKEN_BUDGET
+        places_text: Dict[str, str] = {}
+        places_tokens = 0
+        for name, (id_prefix, places) in lists.items():
+            share = budget * len(places) // total_places if budget else 0
+            places_text[name], tokens = _format_places_for_prompt(places, id_prefix, max(share, 1) if budget else 0)
+            places_tokens += tokens
+
+        travel_styles = ", ".join([s.value for s in (trip_request.travel_style or [])])
+        interests = ", ".join(trip_request.interests or [])
+
+        inputs = {
+            "destination": trip_request.destination,
+            "start_date": trip_request.start_date,
+            "end_date": trip_request.end_date,
+            "total_days": total_days,
+            "travelers": trip_request.travelers,
+            "budget": trip_request.budget or "moderate",
+            "travel_style": travel_styles or "cultural",
+            "interests": interests or "general sightseeing",
+            "special_requirements": trip_request.special_requirements or "none",
+            "restaurants_data": places_text["restaurants"],
+            "attractions_data": places_text["attractions"],
+            "hotels_data": places_text["hotels"],
+        }
+
+        input_tokens = estimate_tokens(TRIP_PLANNER_PROMPT.format(**inputs))
+        _prompt_stats["requests"] += 1
+        _prompt_stats["last_input_tokens"] = input_tokens
+        _prompt_stats["last_places_tokens"] = places_tokens
+        _prompt_stats["total_input_tokens"] += input_tokens
+        observe_prompt_tokens(input_tokens, places_tokens)
+
+    return inputs, destination_data
+
+
+def _finalize_itinerary(result: Dict[str, Any], destination_data: Dict[str, Any]) -> TripItinerary:
+    """Reorder each day's route, enrich the LLM output with real Places data and validate it."""
+    if settings.ROUTE_OPTIMIZATION_ENABLED:
+        before, after = optimize_itinerary_routes(result)
+        if before > after:
+            print(f"🧭 Route optimization: {before:.1f} km → {after:.1f} km of activity travel")
 
-    # 2. Calculate total days
-    start = datetime.strptime(trip_request.start_date, "%Y-%m-%d")
-    end = datetime.strptime(trip_request.end_date, "%Y-%m-%d")
-    total_days = max((end - start).days + 1, 1)
-
-    # 3. Format data for prompt
-    restaurants_text = _format_places_for_prompt(destination_data["restaurants"])
-    attractions_text = _format_places_for_prompt(destination_data["attractions"])
-    hotels_text = _format_places_for_prompt(destination_data["hotels"])
-
-    travel_styles = ", ".join([s.value for s in (trip_request.travel_style or [])])
-    interests = ", ".join(trip_request.interests or [])
-
-    # 4. Build and invoke LangChain chain
-    llm = _get_llm()
-    parser = JsonOutputParser()
-    chain = TRIP_PLANNER_PROMPT | llm | parser
-
-    result = await chain.ainvoke({
-        "destination": trip_request.destination,
-        "start_date": trip_request.start_date,
-        "end_date": trip_request.end_date,
-        "total_days": total_days,
-        "travelers": trip_request.travelers,
-        "budget": trip_request.budget or "moderate",
-        "travel_style": travel_styles or "cultural",
-        "interests": interests or "general sightseeing",
-        "special_requirements": trip_request.special_requirements or "none",
-        "restaurants_data": restaurants_text,
-        "attractions_data": attractions_text,
-        "hotels_data": hotels_text,
-    })
-
-    # 5. Enrich with real Google Places data
     if destination_data["restaurants"]:
         result["top_restaurants"] = destination_data["restaurants"][:8]
     if destination_data["attractions"]:
         result["top_attractions"] = destination_data["attractions"][:10]
 
-    # 6. Parse into TripItinerary model
-    itinerary = TripItinerary(**result)
+    return TripItinerary(**result)
+
+
+async def _generate_single(inputs: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+    """Stream one full-itinerary call, yielding header/day events then ("result", dict)."""
+    chain = _get_chain("itinerary_stream")
+    stream_parser = ItineraryStreamParser()
+
+    with LLM_IN_FLIGHT.track_inprogress():
+        async for chunk in chain.astream(inputs):
+            for event in stream_parser.feed(chunk):
+                yield event
+
+    yield "result", parse_json_markdown(stream_parser.text)
+
+
+def _window_days(result: Any, first: int, last: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    The days of a window response in order, or None unless there is exactly one
+    day per requested day. Day numbers, when given, must cover the window
+    (absolute or 1-based), so a skipped day isn't shifted onto the next date.
+    """
+    days = result.get("days") if isinstance(result, dict) else result
+    count = last - first + 1
+    if not isinstance(days, list) or len(days) != count or not all(isinstance(d, dict) for d in days):
+        return None
+    numbers = [d.get("day") for d in days]
+    if all(isinstance(n, int) for n in numbers):
+        offset = first if sorted(numbers) == list(range(first, last + 1)) else 1
+        if sorted(numbers) != list(range(offset, offset + count)):
+            return None
+        days = sorted(days, key=lambda d: d["day"])
+    return days
+
+
+async def _generate_chunked(inputs: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Generate a skeleton, then the days in concurrent windows of
+    GENERATION_CHUNK_DAYS. Yields ("header", dict), ("day", dict) per day as
+    its window finishes, then ("result", dict) with the stitched itinerary.
+    """
+    total_days = inputs["total_days"]
+    start = datetime.strptime(inputs["start_date"], "%Y-%m-%d")
+
+    # 1. Skeleton: shared metadata plus one theme per day
+    with LLM_IN_FLIGHT.track_inprogress():
+        skeleton = await _get_chain("skeleton").ainvoke(inputs)
+    if not isinstance(skeleton, dict):
+        raise ValueError("Model did not return the itinerary outline")
+    day_themes = skeleton.pop("day_themes", None)
+    themes = {
+        t.get("day"): t.get("theme", "")
+        for t in (day_themes if isinstance(day_themes, list) else [])
+        if isinstance(t, dict)
+    }
+    skeleton["total_days"] = total_days
+    yield "header", dict(skeleton)
+
+    def day_date(day_number: int) -> str:
+        return (start + timedelta(days=day_number - 1)).strftime("%Y-%m-%d")
+
+    day_outline = "\n".join(
+        f"Day {n} ({day_date(n)}): {themes.get(n) or 'Free exploration'}"
+        for n in range(1, total_days + 1)
+    )
+
+    # 2. Day windows, generated concurrently
+    days_chain = _get_chain("days")
+    semaphore = asyncio.Semaphore(max(settings.GENERATION_CHUNK_CONCURRENCY, 1))
+    window = max(settings.GENERATION_CHUNK_DAYS, 1)
+
+    async def generate_window(first: int, last: int) -> List[Dict[str, Any]]:
+        days = None
+        for _ in range(2):  # one retry for a window with missing or skipped days
+            async with semaphore:
+                with LLM_IN_FLIGHT.track_inprogress():
+                    result = await days_chain.ainvoke({
+                        **inputs,
+                        "day_outline": day_outline,
+                        "day_start": first,
+                        "day_end": last,
+                    })
+            days = _window_days(result, first, last)
+            if days is not None:
+                break
+        if days is None:
+            raise ValueError(f"Model did not return days {first}-{last} of the itinerary")
+
+        # Renumber by position so windows stitch together without gaps or overlaps
+        stitched = []
+        for day_number, day in zip(range(first, last + 1), days):
+            day["day"] = day_number
+            day["date"] = day_date(day_number)
+            day.setdefault("theme", themes.get(day_number, ""))
+            stitched.append(day)
+        return stitched
+
+    tasks = [
+        asyncio.ensure_future(generate_window(first, min(first + window - 1, total_days)))
+        for first in range(1, total_days + 1, window)
+    ]
+    all_days: List[Dict[str, Any]] = []
+    try:
+        for next_window in asyncio.as_completed(tasks):
+            for day in await next_window:
+                all_days.append(day)
+                yield "day", day
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    # 3. Stitch
+    skeleton["days"] = sorted(all_days, key=lambda d: d["day"])
+    yield "result", skeleton
+
+
+async def generate_trip_itinerary(trip_request: TripRequest, use_cache: bool = True) -> TripItinerary:
+    """Generate a complete trip itinerary using LangChain + Gemini."""
+
+    # Serve an identical (normalized) earlier request from the result cache
+    cache_key = _itinerary_cache_key(trip_request)
+    if use_cache:
+        cached = await itinerary_cache.get_cached_itinerary(cache_key, trip_request.start_date)
+        if cached is not None:
+            return cached
+
+    with track_stale() as stale:
+        inputs, destination_data = await _build_prompt_inputs(trip_request)
+
+    result = None
+    text = None
+    with time_stage("llm"):
+        if _use_chunked(trip_request):
+            async for event, data in _generate_chunked(inputs):
+                if event == "result":
+                    result = data
+        else:
+            # Invoke the shared LangChain chain; the JSON is parsed below so it is timed on its own
+            with LLM_IN_FLIGHT.track_inprogress():
+                text = await _get_chain("itinerary_stream").ainvoke(inputs)
+
+    # Enrich with real Google Places data and parse into TripItinerary model
+    with time_stage("parse_validate"):
+        if text is not None:
+            result = parse_json_markdown(text)
+        itinerary = _finalize_itinerary(result, destination_data)
+    # Itineraries built on circuit-breaker fallback places aren't cached for a day
+    if not stale.stale:
+        await itinerary_cache.store_itinerary(cache_key, itinerary)
     return itinerary
+
+
+async def stream_trip_itinerary(
+    trip_request: TripRequest, use_cache: bool = True
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Generate an itinerary, yielding ("header", dict) once the top-level fields
+    are known, ("day", dict) as each DayPlan completes, and finally
+    ("itinerary", TripItinerary) with the validated, enriched result.
+    """
+    cache_key = _itinerary_cache_key(trip_request)
+    if use_cache:
+        cached = await itinerary_cache.get_cached_itinerary(cache_key, trip_request.start_date)
+        if cached is not None:
+            yield "header", cached.model_dump(exclude={"days", "top_restaurants", "top_attractions"})
+            for day in cached.days:
+                yield "day", day.model_dump()
+            yield "itinerary", cached
+            return
+
+    with track_stale() as stale:
+        inputs, destination_data = await _build_prompt_inputs(trip_request)
+    generator = _generate_chunked(inputs) if _use_chunked(trip_request) else _generate_single(inputs)
+
+    result = None
+    # "llm" counts only the waits on the model, not time spent handing events to the client
+    async for event, data in time_stage_iter("llm", generator):
+        if event == "result":
+            result = data
+            continue
+        if event == "day":
+            if settings.ROUTE_OPTIMIZATION_ENABLED:
+                optimize_day(data)
+            try:
+                data = DayPlan(**data).model_dump()
+            except ValidationError:
+                # Leave malformed days to the final validation
+                continue
+        yield event, data
+
+    with time_stage("parse_validate"):
+        itinerary = _finalize_itinerary(result, destination_data)
+    if not stale.stale:
+        await itinerary_cache.store_itinerary(cache_key, itinerary)
+    yield "itinerary", itinerary
@@ -3,26 +3,58 @@ Authentication Service
 JWT token management and password hashing.
 """
 
+import asyncio
+import hmac
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.config import settings
 from app.database import get_db
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.memory_cache import NamespacedCache
+
+# Hashes below BCRYPT_ROUNDS are flagged for an upgrade on the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
 security = HTTPBearer(auto_error=False)
 
+# Verified token payloads and user documents, so most requests skip decode + find_one
+_auth_cache = NamespacedCache({
+    "tokens": (settings.AUTH_CACHE_MAX_BYTES, settings.AUTH_CACHE_TTL),
+    "users": (settings.AUTH_CACHE_MAX_BYTES, settings.AUTH_CACHE_TTL),
+})
+_auth_stats: Dict[str, int] = {"user_lookups": 0, "claims_only": 0}
+
+# Fields never loaded for (or cached with) the current user
+_USER_PROJECTION = {"password_hash": 0}
+
+# bcrypt releases the GIL, so a thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
 
+def close_password_hasher():
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Check a password; also returns a re-hashed value when the stored cost factor is outdated."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -42,20 +74,49 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+def _verified_payload(token: str) -> Optional[dict]:
+    """decode_token with a cache; cached payloads still honour their exp claim."""
+    payload = _auth_cache.get("tokens", token)
+    if payload is not None:
+        if payload.get("exp", 0) > datetime.now(timezone.utc).timestamp():
+            return payload
+        _auth_cache.delete("tokens", token)
+        return None
+
+    payload = decode_token(token)
+    if payload:
+        _auth_cache.set("tokens", token, payload)
+    return payload
+
+
+def invalidate_user(email: str):
+    """
+    Drop a cached user document. Every write to a users document must call this;
+    today those are registration and the password rehash on login (app/routers/auth.py).
+    """
+    _auth_cache.delete("users", email)
+
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current authenticated user from JWT token. Returns None if no token."""
     if not credentials:
         return None
 
-    payload = decode_token(credentials.credentials)
+    payload = _verified_payload(credentials.credentials)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
 
-    db = get_db()
-    user = await db.users.find_one({"email": payload.get("sub")})
+    email = payload.get("sub")
+    user = _auth_cache.get("users", email) if email else None
+    if user is None:
+        _auth_stats["user_lookups"] += 1
+        db = get_db()
+        user = await db.users.find_one({"email": email}, _USER_PROJECTION)
+        if user:
+            _auth_cache.set("users", email, user)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -65,6 +126,36 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return user
 
 
+async def get_current_user_readonly(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    get_current_user for read-only routes. With AUTH_TRUST_CLAIMS_ON_READS the
+    signed token claims stand in for the user document (no lookup at all);
+    tokens without a uid claim fall back to the normal path.
+    """
+    if credentials and settings.AUTH_TRUST_CLAIMS_ON_READS:
+        payload = _verified_payload(credentials.credentials)
+        if payload and payload.get("uid"):
+            _auth_stats["claims_only"] += 1
+            return {"_id": payload["uid"], "email": payload.get("sub"), "name": payload.get("name")}
+    return await get_current_user(credentials)
+
+
+def auth_cache_stats() -> Dict[str, Any]:
+    return {**_auth_stats, **_auth_cache.stats()}
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Constant-time check against PROFILER_ADMIN_TOKEN; always False when it isn't set."""
+    expected = settings.PROFILER_ADMIN_TOKEN
+    return bool(expected and token) and hmac.compare_digest(token.encode(), expected.encode())
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Operator-only routes (/debug, /health/stats): X-Admin-Token must match PROFILER_ADMIN_TOKEN."""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+
 async def require_auth(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Require authentication — raise error if no valid token."""
     if not credentials:
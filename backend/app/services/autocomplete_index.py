@@ -0,0 +1,93 @@
+"""
+Autocomplete Prefix Index
+Character trie over known destination suggestions (past trip destinations and
+earlier autocomplete results). Every node keeps its top suggestions by weight,
+so a prefix lookup is a walk of len(prefix) nodes with no scan.
+"""
+
+import unicodedata
+from typing import Dict, List, Optional
+
+# Prefixes longer than this aren't indexed; they go to the cache/upstream path
+MAX_INDEXED_PREFIX = 24
+_WORD_BREAKS = " ,-/"
+
+
+def normalize_text(text: str) -> str:
+    """Casefold, strip accents and collapse whitespace ("São  Paulo" -> "sao paulo")."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def matches_prefix(suggestion: Dict[str, str], prefix: str) -> bool:
+    """True if any word of the suggestion's description starts with the normalized prefix."""
+    text = normalize_text(suggestion.get("description", ""))
+    starts = [0] + [i + 1 for i, ch in enumerate(text) if ch in _WORD_BREAKS]
+    return any(text.startswith(prefix, start) for start in starts)
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.top: List[str] = []
+
+
+class PrefixIndex:
+    """Trie keyed on normalized description and main text; nodes hold up to top_k entry keys."""
+
+    def __init__(self, top_k: int = 10, max_entries: int = 5000):
+        self.top_k = top_k
+        self.max_entries = max_entries
+        self._root = _Node()
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._weights: Dict[str, float] = {}
+        self.nodes = 1
+        self.rejected = 0
+
+    def add(self, suggestion: Dict[str, str], weight: float = 1.0):
+        """Insert a suggestion or raise its weight; a later entry with a place_id replaces one without."""
+        key = normalize_text(suggestion.get("description", ""))
+        if not key:
+            return
+        if key not in self._entries:
+            if len(self._entries) >= self.max_entries:
+                self.rejected += 1
+                return
+            self._entries[key] = suggestion
+            self._weights[key] = 0.0
+        elif suggestion.get("place_id") and not self._entries[key].get("place_id"):
+            self._entries[key] = suggestion
+        self._weights[key] += weight
+
+        # Weights only grow, so re-ranking along this entry's own paths keeps every node exact
+        terms = {key, normalize_text(suggestion.get("main_text", ""))}
+        for term in terms:
+            node = self._root
+            for ch in term[:MAX_INDEXED_PREFIX]:
+                child = node.children.get(ch)
+                if child is None:
+                    child = node.children[ch] = _Node()
+                    self.nodes += 1
+                node = child
+                if key not in node.top:
+                    node.top.append(key)
+                node.top.sort(key=lambda k: self._weights[k], reverse=True)
+                del node.top[self.top_k:]
+
+    def query(self, prefix: str, limit: int = 5) -> Optional[List[Dict[str, str]]]:
+        """Top suggestions for prefix, or None if the prefix is too long to be indexed."""
+        prefix = normalize_text(prefix)
+        if len(prefix) > MAX_INDEXED_PREFIX:
+            return None
+        node = self._root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [self._entries[key] for key in node.top[:limit]]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "nodes": self.nodes, "rejected": self.rejected}
@@ -0,0 +1,237 @@
+"""
+Circuit Breakers for Google APIs
+One breaker per endpoint watches a rolling window of call outcomes. When too
+many fail or run slow it opens, and calls fail fast with the last known good
+response for the same request instead of waiting out the HTTP timeout. After
+CIRCUIT_OPEN_SECONDS a probe call is let through (half-open); success closes
+the breaker, failure opens it again.
+
+Fallback data is flagged through a stale scope: services use track_stale() to
+avoid caching it as fresh, shared_call() carries the flag out of single-flight
+tasks, and StaleDataMiddleware reports it to the client in an X-Stale-Data header.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from app.config import settings
+from app.services.memory_cache import NamespacedCache
+from app.services.metrics import set_circuit_state
+from app.services.singleflight import SingleFlight
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Body statuses that mean Google itself is failing (quota errors are the scheduler's job)
+FAILURE_STATUSES = {"UNKNOWN_ERROR"}
+
+STALE_HEADER = b"x-stale-data"
+
+
+class CircuitBreaker:
+    """Closed -> open on error/slow-call ratio; open -> half-open after a cool-down; one probe decides."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=settings.CIRCUIT_WINDOW)
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+        self.slow_calls = 0
+
+    def allow(self) -> bool:
+        """True if a call may go upstream now; half-open admits a limited number of probes."""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < settings.CIRCUIT_OPEN_SECONDS:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= settings.CIRCUIT_HALF_OPEN_PROBES:
+                self.rejected += 1
+                return False
+            self._probes += 1
+        return True
+
+    def record(self, healthy: Optional[bool], seconds: float):
+        """Outcome of an allowed call; None (cancelled, unusable body) only frees a probe slot."""
+        if self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+        if healthy is None:
+            return
+        if healthy and seconds >= settings.CIRCUIT_SLOW_CALL_SECONDS:
+            self.slow_calls += 1
+            healthy = False
+
+        if self.state == HALF_OPEN:
+            if healthy:
+                self._outcomes.clear()
+                self._transition(CLOSED)
+            else:
+                self._open()
+            return
+
+        self._outcomes.append(healthy)
+        failures = self._outcomes.count(False)
+        if (
+            self.state == CLOSED
+            and len(self._outcomes) >= settings.CIRCUIT_MIN_CALLS
+            and failures / len(self._outcomes) >= settings.CIRCUIT_FAILURE_RATIO
+        ):
+            self._open()
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self.opened += 1
+        self._transition(OPEN)
+
+    def _transition(self, state: str):
+        if state != self.state:
+            print(f"⚡ Circuit {self.name}: {self.state} → {state}")
+        self.state = state
+        self._probes = 0
+        set_circuit_state(self.name, state)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "window": len(self._outcomes),
+            "failures": self._outcomes.count(False),
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "slow_calls": self.slow_calls,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+# Last OK body per request, served while a breaker is open or a call fails outright
+_last_good = NamespacedCache({
+    "responses": (settings.CIRCUIT_FALLBACK_MAX_BYTES, settings.CIRCUIT_FALLBACK_TTL),
+})
+_fallback_stats: Dict[str, int] = {"served": 0, "unavailable": 0}
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    breaker = _breakers.get(endpoint)
+    if breaker is None:
+        breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+    return breaker
+
+
+def _request_key(endpoint: str, params: Dict[str, Any]) -> str:
+    return endpoint + "?" + urlencode(sorted((k, v) for k, v in params.items() if k != "key"))
+
+
+def remember(endpoint: str, params: Dict[str, Any], data: Dict[str, Any]):
+    """Keep an OK response as the fallback for this request."""
+    _last_good.set("responses", _request_key(endpoint, params), data)
+
+
+def last_good(endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Last OK body for this request, marking the current stale scope; None if there is none."""
+    data = _last_good.get("responses", _request_key(endpoint, params))
+    if data is None:
+        _fallback_stats["unavailable"] += 1
+        return None
+    _fallback_stats["served"] += 1
+    mark_stale(endpoint)
+    return data
+
+
+def fallback(endpoint: str, params: Dict[str, Any], status: str, message: str) -> Dict[str, Any]:
+    """Last known good body for this request, else an error body callers treat as an API error."""
+    data = last_good(endpoint, params)
+    return data if data is not None else {"status": status, "error_message": message}
+
+
+# ── Stale scopes ──
+
+class StaleScope:
+    """Collects endpoints whose fallback data was used; marks propagate to enclosing scopes."""
+
+    __slots__ = ("parent", "endpoints")
+
+    def __init__(self, parent: Optional["StaleScope"] = None):
+        self.parent = parent
+        self.endpoints: Set[str] = set()
+
+    @property
+    def stale(self) -> bool:
+        return bool(self.endpoints)
+
+
+_stale_scope: ContextVar[Optional[StaleScope]] = ContextVar("stale_scope", default=None)
+
+
+def mark_stale(endpoint: str):
+    scope = _stale_scope.get()
+    while scope is not None:
+        scope.endpoints.add(endpoint)
+        scope = scope.parent
+
+
+@contextmanager
+def track_stale():
+    """Scope that reports whether any call inside it (or in tasks it starts) fell back to stale data."""
+    scope = StaleScope(_stale_scope.get())
+    token = _stale_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _stale_scope.reset(token)
+
+
+async def shared_call(flight: SingleFlight, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    flight.do(key, fn) that reports fallback data to every caller. The shared
+    task only inherits the first caller's context, so it tracks staleness in a
+    scope of its own and each caller, including ones that joined, re-marks theirs.
+    """
+    async def tracked() -> Tuple[Any, FrozenSet[str]]:
+        scope = StaleScope()
+        token = _stale_scope.set(scope)
+        try:
+            return await fn(), frozenset(scope.endpoints)
+        finally:
+            _stale_scope.reset(token)
+
+    value, endpoints = await flight.do(key, tracked)
+    for endpoint in endpoints:
+        mark_stale(endpoint)
+    return value
+
+
+class StaleDataMiddleware:
+    """Adds X-Stale-Data: <endpoints> to responses built from fallback data."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_stale() as stale:
+            async def send_with_flag(message):
+                if message["type"] == "http.response.start" and stale.stale:
+                    flag = ",".join(sorted(stale.endpoints)).encode()
+                    message["headers"] = [*message.get("headers", []), (STALE_HEADER, flag)]
+                await send(message)
+
+            await self.app(scope, receive, send_with_flag)
+
+
+def circuit_stats() -> Dict[str, Any]:
+    return {
+        "breakers": {name: breaker.stats() for name, breaker in _breakers.items()},
+        "fallback": {**_fallback_stats, "cache": _last_good.stats()["responses"]},
+    }
@@ -0,0 +1,131 @@
+"""
+Geospatial Place Index
+In-memory grid index over every PlaceInfo returned by Places searches, so
+"top-rated places of type X within R km" can be answered without calling Google.
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models import PlaceInfo
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class GeoIndex:
+    """Fixed-size lat/lng grid (cells of cell_km at the equator) with per-cell place ids."""
+
+    def __init__(self, cell_km: float = 1.0, max_places: int = 50000):
+        self.cell_deg = cell_km / KM_PER_DEGREE_LAT
+        self.max_places = max_places
+        self._places: "OrderedDict[str, PlaceInfo]" = OrderedDict()
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self.queries = 0
+        self.cells_visited = 0
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    @staticmethod
+    def _key(place: PlaceInfo) -> str:
+        return place.place_id or f"{place.name}@{place.latitude:.5f},{place.longitude:.5f}"
+
+    def add(self, places: Iterable[PlaceInfo]):
+        for place in places:
+            if place.latitude is None or place.longitude is None:
+                continue
+            key = self._key(place)
+            old = self._places.pop(key, None)
+            if old is not None:
+                self._cells[self._cell(old.latitude, old.longitude)].discard(key)
+            self._places[key] = place
+            self._cells.setdefault(self._cell(place.latitude, place.longitude), set()).add(key)
+
+        while len(self._places) > self.max_places:
+            key, oldest = self._places.popitem(last=False)
+            cell = self._cell(oldest.latitude, oldest.longitude)
+            self._cells[cell].discard(key)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def _col_ranges(self, lat: float, lng: float, d_lat: float, radius_km: float) -> List[Tuple[int, int]]:
+        """Column ranges covering lng ± the radius, split where the box crosses the antimeridian."""
+        cos_lat = math.cos(math.radians(lat))
+        if abs(lat) + d_lat >= 90.0 or radius_km >= KM_PER_DEGREE_LAT * 180.0 * cos_lat:
+            spans = [(-180.0, 180.0)]  # the circle reaches a pole or wraps the whole parallel
+        else:
+            d_lng = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+            lng = (lng + 180.0) % 360.0 - 180.0
+            low, high = lng - d_lng, lng + d_lng
+            if low < -180.0:
+                spans = [(-180.0, high), (low + 360.0, 180.0)]
+            elif high > 180.0:
+                spans = [(low, 180.0), (-180.0, high - 360.0)]
+            else:
+                spans = [(low, high)]
+        return [(self._cell(0, low)[1], self._cell(0, high)[1]) for low, high in spans]
+
+    def query(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        place_type: Optional[str] = None,
+        min_rating: float = 0.0,
+        limit: int = 10,
+    ) -> List[Tuple[PlaceInfo, float]]:
+        """Top-rated places within radius_km, as (place, distance_km) pairs."""
+        self.queries += 1
+        d_lat = radius_km / KM_PER_DEGREE_LAT
+        min_row = self._cell(max(lat - d_lat, -90.0), 0)[0]
+        max_row = self._cell(min(lat + d_lat, 90.0), 0)[0]
+        col_ranges = self._col_ranges(lat, lng, d_lat, radius_km)
+
+        box_cells = (max_row - min_row + 1) * sum(hi - lo + 1 for lo, hi in col_ranges)
+        if box_cells > len(self._cells):
+            # Wide boxes (large radius, near the poles) scan only the populated cells
+            cells = [
+                cell for cell in self._cells
+                if min_row <= cell[0] <= max_row and any(lo <= cell[1] <= hi for lo, hi in col_ranges)
+            ]
+        else:
+            cells = [
+                (row, col)
+                for row in range(min_row, max_row + 1)
+                for lo, hi in col_ranges
+                for col in range(lo, hi + 1)
+            ]
+
+        self.cells_visited += len(cells)
+        matches = []
+        for cell in cells:
+            for key in self._cells.get(cell, ()):
+                place = self._places[key]
+                if (place.rating or 0) < min_rating:
+                    continue
+                if place_type and place_type not in (place.types or []):
+                    continue
+                distance = haversine_km(lat, lng, place.latitude, place.longitude)
+                if distance <= radius_km:
+                    matches.append((place, distance))
+
+        matches.sort(key=lambda m: (m[0].rating or 0, m[0].total_ratings or 0), reverse=True)
+        return matches[:limit]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "places": len(self._places),
+            "cells": len(self._cells),
+            "queries": self.queries,
+            "cells_visited": self.cells_visited,
+        }
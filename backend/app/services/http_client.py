@@ -0,0 +1,191 @@
+"""
+Shared Outbound HTTP Client
+A single pooled httpx.AsyncClient reused by every Google Maps / Places call,
+so requests ride on kept-alive connections instead of a fresh TCP+TLS handshake.
+Calls go through a per-endpoint circuit breaker and the outbound scheduler's
+quota buckets and retry policy.
+"""
+
+import asyncio
+import time
+
+import httpx
+from typing import Dict, Any, Optional
+
+from app.config import settings
+from app.services.circuit_breaker import FAILURE_STATUSES, fallback, get_breaker, last_good, remember
+from app.services.metrics import observe_outbound
+from app.services.outbound_scheduler import RETRYABLE_STATUSES, acquire, backoff_delay, current_deadline, penalize
+
+_client: Optional[httpx.AsyncClient] = None
+
+# Usage counters, reported by pool_stats()
+_stats: Dict[str, int] = {"requests": 0, "in_flight": 0, "errors": 0, "connections_opened": 0}
+_endpoint_requests: Dict[str, int] = {}
+
+
+def _endpoint_timeouts() -> Dict[str, float]:
+    """Read timeout per Google endpoint, in seconds."""
+    return {
+        "textsearch": settings.HTTP_TIMEOUT_PLACES_SEARCH,
+        "details": settings.HTTP_TIMEOUT_PLACES_DETAILS,
+        "autocomplete": settings.HTTP_TIMEOUT_AUTOCOMPLETE,
+        "directions": settings.HTTP_TIMEOUT_DIRECTIONS,
+        "distancematrix": settings.HTTP_TIMEOUT_DISTANCE_MATRIX,
+        "geocode": settings.HTTP_TIMEOUT_GEOCODE,
+    }
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP2_ENABLED and _http2_available()
+    if settings.HTTP2_ENABLED and not http2:
+        print("⚠️  HTTP2_ENABLED is set but 'h2' is not installed — falling back to HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(15.0, connect=settings.HTTP_CONNECT_TIMEOUT),
+    )
+
+
+async def start_http_client():
+    global _client
+    if _client is None:
+        _client = _build_client()
+    print(
+        f"🌐 Outbound HTTP client ready "
+        f"(max {settings.HTTP_MAX_CONNECTIONS} connections, "
+        f"{settings.HTTP_MAX_KEEPALIVE_CONNECTIONS} keep-alive)"
+    )
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        print("🔌 Outbound HTTP client closed")
+
+
+async def _trace(event: str, info: Dict[str, Any]):
+    """httpx request trace hook: count new TCP connections (the rest reused a pooled one)."""
+    if event == "connection.connect_tcp.complete":
+        _stats["connections_opened"] += 1
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily when used outside the app lifespan."""
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+async def _get_once(endpoint: str, url: str, params: Dict[str, Any], timeout: httpx.Timeout) -> Dict[str, Any]:
+    """One GET on the shared client; 429 and 5xx responses raise httpx.HTTPStatusError."""
+    client = get_http_client()
+    _stats["requests"] += 1
+    _stats["in_flight"] += 1
+    _endpoint_requests[endpoint] = _endpoint_requests.get(endpoint, 0) + 1
+    started = time.perf_counter()
+    status = "EXCEPTION"
+    try:
+        response = await client.get(url, params=params, timeout=timeout, extensions={"trace": _trace})
+        status = f"HTTP_{response.status_code}"
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+        data = response.json()
+        # Google reports API-level outcomes (OK, ZERO_RESULTS, OVER_QUERY_LIMIT...) in the body
+        status = data.get("status", status) if isinstance(data, dict) else status
+        return data
+    except Exception:
+        _stats["errors"] += 1
+        raise
+    finally:
+        _stats["in_flight"] -= 1
+        observe_outbound(endpoint, status, time.perf_counter() - started)
+
+
+async def get_json(endpoint: str, url: str, params: Dict[str, Any], cost: float = 1) -> Dict[str, Any]:
+    """
+    GET a Google API URL and decode the JSON body. Each attempt first passes the
+    endpoint's circuit breaker and takes `cost` tokens from its quota bucket;
+    OVER_QUERY_LIMIT, UNKNOWN_ERROR, 429/5xx and transport errors are retried with
+    jittered backoff until the deadline. When the breaker is open, no token is free
+    in time, or every attempt failed, the last good response for the same request
+    is returned (marked stale); without one, an error body is returned (or the
+    transport error raised), which callers already treat as an API error.
+    """
+    deadline = current_deadline()
+    breaker = get_breaker(endpoint)
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            return fallback(endpoint, params, "UNAVAILABLE", f"Circuit open for {endpoint}")
+        if not await acquire(endpoint, cost, deadline):
+            breaker.record(None, 0.0)
+            return fallback(endpoint, params, "OVER_QUERY_LIMIT", "Quota wait exceeded the request deadline")
+
+        remaining = max(deadline - time.monotonic(), 0.001)
+        timeout = httpx.Timeout(
+            min(_endpoint_timeouts().get(endpoint, 15.0), remaining),
+            connect=min(settings.HTTP_CONNECT_TIMEOUT, remaining),
+        )
+        attempt += 1
+        started = time.perf_counter()
+        try:
+            data = await _get_once(endpoint, url, params, timeout)
+        except (httpx.TransportError, httpx.HTTPStatusError):
+            breaker.record(False, time.perf_counter() - started)
+            delay = backoff_delay(attempt, deadline)
+            if delay is None:
+                stale = last_good(endpoint, params)
+                if stale is None:
+                    raise
+                return stale
+        except BaseException:
+            breaker.record(None, 0.0)
+            raise
+        else:
+            status = data.get("status") if isinstance(data, dict) else None
+            breaker.record(status not in FAILURE_STATUSES, time.perf_counter() - started)
+            if status == "OK":
+                remember(endpoint, params, data)
+            if status not in RETRYABLE_STATUSES:
+                return data
+            if status == "OVER_QUERY_LIMIT":
+                penalize(endpoint)
+            delay = backoff_delay(attempt, deadline)
+            if delay is None:
+                return fallback(endpoint, params, status, data.get("error_message", ""))
+        await asyncio.sleep(delay)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Snapshot of request counters and connection reuse (public httpx APIs only)."""
+    opened = _stats["connections_opened"]
+    return {
+        "requests": _stats["requests"],
+        "in_flight": _stats["in_flight"],
+        "errors": _stats["errors"],
+        "by_endpoint": dict(_endpoint_requests),
+        "connections": {
+            "opened": opened,
+            "reused_requests": max(_stats["requests"] - opened, 0),
+            "max": settings.HTTP_MAX_CONNECTIONS,
+            "max_keepalive": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        },
+        "http2": bool(_client is not None and settings.HTTP2_ENABLED and _http2_available()),
+    }
@@ -0,0 +1,137 @@
+"""
+Itinerary Result Cache
+Exact-match cache of generated itineraries, keyed on a normalized TripRequest
+plus the prompt and model version. Requests that differ only in casing, style
+order or the actual dates (same number of days) reuse one Gemini result, with
+day dates re-based onto the new trip window.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.config import settings
+from app.database import get_db
+from app.models import TripRequest, TripItinerary
+from app.services.memory_cache import NamespacedCache
+
+_local_cache = NamespacedCache({
+    "itineraries": (settings.ITINERARY_CACHE_MAX_BYTES, settings.ITINERARY_CACHE_TTL),
+})
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def _normalize_text(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).casefold()
+
+
+def _normalize_list(values: Optional[List[str]]) -> List[str]:
+    return sorted({_normalize_text(v) for v in (values or []) if _normalize_text(v)})
+
+
+def trip_total_days(trip_request: TripRequest) -> int:
+    start = datetime.strptime(trip_request.start_date, "%Y-%m-%d")
+    end = datetime.strptime(trip_request.end_date, "%Y-%m-%d")
+    return max((end - start).days + 1, 1)
+
+
+def canonical_request(trip_request: TripRequest) -> Dict[str, Any]:
+    """Reduce a TripRequest to the fields that change the generated itinerary."""
+    return {
+        "destination": _normalize_text(trip_request.destination),
+        "total_days": trip_total_days(trip_request),
+        "travelers": trip_request.travelers,
+        "budget": _normalize_text(trip_request.budget or "moderate"),
+        "travel_style": _normalize_list([s.value for s in (trip_request.travel_style or [])]),
+        "interests": _normalize_list(trip_request.interests),
+        "special_requirements": _normalize_text(trip_request.special_requirements),
+    }
+
+
+def prompt_hash(*prompts: ChatPromptTemplate) -> str:
+    """Stable hash of the prompt templates, so prompt edits invalidate old entries."""
+    digest = hashlib.sha256()
+    for prompt in prompts:
+        for message in prompt.messages:
+            digest.update(message.prompt.template.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def cache_key(trip_request: TripRequest, prompt_version: str, model: str) -> str:
+    payload = json.dumps(
+        {"request": canonical_request(trip_request), "prompt": prompt_version, "model": model},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _rebase_dates(itinerary: Dict[str, Any], start_date: str) -> Dict[str, Any]:
+    """Point each day's date at the requested trip window, by day number."""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    rebased = dict(itinerary)
+    rebased["days"] = []
+    for index, day in enumerate(itinerary.get("days", [])):
+        day = dict(day)
+        offset = (day.get("day") or index + 1) - 1
+        day["date"] = (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+        rebased["days"].append(day)
+    return rebased
+
+
+async def get_cached_itinerary(key: str, start_date: str) -> Optional[TripItinerary]:
+    """Return the cached itinerary for key with dates starting at start_date."""
+    if not settings.ITINERARY_CACHE_ENABLED:
+        return None
+
+    cached = _local_cache.get("itineraries", key)
+    if cached is None:
+        try:
+            doc = await get_db().itinerary_cache.find_one({"_id": key})
+        except Exception as e:
+            _stats["errors"] += 1
+            print(f"Itinerary cache read failed: {e}")
+            doc = None
+        expires_at = doc["expires_at"].replace(tzinfo=timezone.utc) if doc else None
+        if doc and expires_at > datetime.now(timezone.utc):
+            cached = doc["itinerary"]
+            _local_cache.set("itineraries", key, cached)
+
+    if cached is None:
+        _stats["misses"] += 1
+        return None
+
+    _stats["hits"] += 1
+    return TripItinerary(**_rebase_dates(cached, start_date))
+
+
+async def store_itinerary(key: str, itinerary: TripItinerary):
+    if not settings.ITINERARY_CACHE_ENABLED:
+        return
+
+    data = itinerary.model_dump()
+    _local_cache.set("itineraries", key, data)
+    try:
+        await get_db().itinerary_cache.replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "itinerary": data,
+                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=settings.ITINERARY_CACHE_TTL),
+            },
+            upsert=True,
+        )
+        _stats["writes"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"Itinerary cache write failed: {e}")
+
+
+def itinerary_cache_stats() -> Dict[str, Any]:
+    return {
+        "enabled": settings.ITINERARY_CACHE_ENABLED,
+        **_stats,
+        "local": _local_cache.stats()["itineraries"],
+    }
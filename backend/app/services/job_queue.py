@@ -0,0 +1,238 @@
+"""
+Trip Generation Job Queue
+Runs itinerary generation outside the HTTP request on a bounded pool of async
+workers. Jobs live in the `trip_jobs` collection, so queued work survives a
+restart, and an atomic claim keeps two instances from running the same job.
+Running jobs heartbeat `updated_at`; a periodic reaper re-queues any whose
+worker stopped heartbeating (crash, killed instance).
+"""
+
+import asyncio
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from bson import ObjectId
+
+from app.config import settings
+from app.database import get_db
+from app.models import TripRequest
+from app.services.ai_service import generate_trip_itinerary
+from app.services.outbound_scheduler import BATCH, outbound_priority
+from app.services.trip_service import save_trip
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+TERMINAL_STATUSES = (COMPLETED, FAILED)
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_reaper: Optional[asyncio.Task] = None
+_listeners: Dict[str, Set[asyncio.Event]] = {}  # one Event per waiting SSE stream
+_running = 0
+_reaped = 0
+
+
+class QueueFullError(Exception):
+    """Raised when the job backlog is at JOB_QUEUE_MAX_SIZE."""
+
+
+async def start_job_workers():
+    """Start the worker pool and reaper, and re-enqueue jobs left over from a previous run."""
+    global _queue, _reaper
+    _queue = asyncio.Queue()
+    db = get_db()
+
+    # Running jobs whose worker died are re-queued here; the put below picks them up
+    await _requeue_stale_jobs(enqueue=False)
+    recovered = 0
+    async for doc in db.trip_jobs.find({"status": QUEUED}, {"_id": 1}).sort("created_at", 1):
+        _queue.put_nowait(str(doc["_id"]))
+        recovered += 1
+
+    for n in range(settings.JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker(n)))
+    _reaper = asyncio.create_task(_reap_stale_jobs())
+    print(f"🧵 Trip job workers started: {settings.JOB_WORKERS} (recovered {recovered} queued jobs)")
+
+
+async def stop_job_workers():
+    global _reaper
+    tasks = _workers + ([_reaper] if _reaper is not None else [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers.clear()
+    _reaper = None
+
+
+async def _requeue_stale_jobs(enqueue: bool = True) -> int:
+    """Move running jobs with no heartbeat for JOB_STALE_SECONDS back to queued."""
+    global _reaped
+    db = get_db()
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    stale = {"status": RUNNING, "updated_at": {"$lt": stale_before}}
+    requeued = 0
+    async for doc in db.trip_jobs.find(stale, {"_id": 1}):
+        # Re-check the condition atomically: another instance may reap or heartbeat it first
+        claimed = await db.trip_jobs.find_one_and_update(
+            {"_id": doc["_id"], **stale},
+            {"$set": {"status": QUEUED, "updated_at": datetime.now(timezone.utc)}},
+        )
+        if claimed is None:
+            continue
+        job_id = str(doc["_id"])
+        requeued += 1
+        _notify(job_id)
+        if enqueue:
+            _queue.put_nowait(job_id)
+    if requeued:
+        _reaped += requeued
+        print(f"🧹 Re-queued {requeued} stale trip jobs")
+    return requeued
+
+
+async def _reap_stale_jobs():
+    while True:
+        await asyncio.sleep(settings.JOB_REAPER_INTERVAL_SECONDS)
+        try:
+            await _requeue_stale_jobs()
+        except Exception as e:
+            print(f"Stale job reaper failed: {e}")
+
+
+async def _heartbeat(job_id: str):
+    """Refresh updated_at while this worker runs the job, so the reaper leaves it alone."""
+    while True:
+        await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+        try:
+            await get_db().trip_jobs.update_one(
+                {"_id": ObjectId(job_id), "status": RUNNING},
+                {"$set": {"updated_at": datetime.now(timezone.utc)}},
+            )
+        except Exception as e:
+            print(f"Heartbeat failed for job {job_id}: {e}")
+
+
+async def submit_job(trip_request: TripRequest, user_id: Optional[str], use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Record a queued job and hand it to the worker pool. Anonymous jobs get an
+    unguessable access_token, the only way to read them back.
+    """
+    if _queue is None:
+        raise RuntimeError("Job workers are not running")
+    if _queue.qsize() >= settings.JOB_QUEUE_MAX_SIZE:
+        raise QueueFullError("Trip generation queue is full")
+
+    now = datetime.now(timezone.utc)
+    job_doc = {
+        "status": QUEUED,
+        "user_id": user_id,
+        "access_token": None if user_id else secrets.token_urlsafe(24),
+        "request": trip_request.model_dump(),
+        "use_cache": use_cache,
+        "trip_id": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    result = await get_db().trip_jobs.insert_one(job_doc)
+    job_doc["_id"] = result.inserted_id
+    _queue.put_nowait(str(result.inserted_id))
+    return job_doc
+
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        oid = ObjectId(job_id)
+    except Exception:
+        return None
+    return await get_db().trip_jobs.find_one({"_id": oid})
+
+
+async def wait_for_change(job_id: str, timeout: float):
+    """Wait until this instance updates the job, or timeout (then callers re-poll)."""
+    event = asyncio.Event()
+    _listeners.setdefault(job_id, set()).add(event)
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass  # the job may be running on another instance; the caller re-polls
+    finally:
+        waiters = _listeners.get(job_id)
+        if waiters is not None:
+            waiters.discard(event)
+            if not waiters:
+                del _listeners[job_id]
+
+
+def _notify(job_id: str):
+    for event in _listeners.pop(job_id, ()):
+        event.set()
+
+
+async def _set_status(job_id: str, status: str, **fields):
+    await get_db().trip_jobs.update_one(
+        {"_id": ObjectId(job_id)},
+        {"$set": {"status": status, "updated_at": datetime.now(timezone.utc), **fields}},
+    )
+    _notify(job_id)
+
+
+async def _worker(n: int):
+    while True:
+        job_id = await _queue.get()
+        try:
+            await _run_job(job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Job worker {n} crashed on {job_id}: {e}")
+        finally:
+            _queue.task_done()
+
+
+async def _run_job(job_id: str):
+    global _running
+
+    # Atomic claim: only one worker (on any instance) moves a job out of "queued"
+    doc = await get_db().trip_jobs.find_one_and_update(
+        {"_id": ObjectId(job_id), "status": QUEUED},
+        {"$set": {"status": RUNNING, "updated_at": datetime.now(timezone.utc)}},
+    )
+    if doc is None:
+        return
+    _notify(job_id)
+
+    _running += 1
+    heartbeat = asyncio.create_task(_heartbeat(job_id))
+    try:
+        trip_request = TripRequest(**doc["request"])
+        with outbound_priority(BATCH):
+            itinerary = await generate_trip_itinerary(trip_request, use_cache=doc.get("use_cache", True))
+        trip = await save_trip(trip_request, itinerary, doc.get("user_id"))
+    except asyncio.CancelledError:
+        # Shutting down mid-job: hand it back so the next start picks it up
+        await _set_status(job_id, QUEUED)
+        raise
+    except Exception as e:
+        print(f"Error generating trip for job {job_id}: {e}")
+        await _set_status(job_id, FAILED, error=f"Failed to generate itinerary: {str(e)}")
+        return
+    finally:
+        heartbeat.cancel()
+        _running -= 1
+
+    await _set_status(job_id, COMPLETED, trip_id=trip.id)
+
+
+def job_queue_stats() -> Dict[str, Any]:
+    return {
+        "workers": len(_workers),
+        "running": _running,
+        "queued": _queue.qsize() if _queue is not None else 0,
+        "max_queued": settings.JOB_QUEUE_MAX_SIZE,
+        "reaped": _reaped,
+    }
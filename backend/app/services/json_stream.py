@@ -0,0 +1,93 @@
+"""
+Incremental Itinerary JSON Parser
+Consumes the LLM's JSON output chunk by chunk and reports the trip header
+(every top-level field before "days") and each day object as soon as its
+closing brace arrives, without waiting for the whole document.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+_DAYS_KEY = re.compile(r'"days"\s*:\s*$')
+
+
+class ItineraryStreamParser:
+    """Feed text chunks; get back ("header", dict) and ("day", dict) events."""
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._root_start: Optional[int] = None
+        self._in_days = False
+        self._day_start: Optional[int] = None
+        self.header_sent = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        self.text += chunk
+        events: List[Tuple[str, Dict[str, Any]]] = []
+        text = self.text
+
+        while self._pos < len(text):
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if self._root_start is None:
+                # Skip anything before the first brace (e.g. a ```json fence)
+                if ch == "{":
+                    self._root_start = i
+                    self._depth = 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if ch == "[" and self._depth == 1 and _DAYS_KEY.search(text, self._root_start, i):
+                    self._in_days = True
+                    header = self._parse_header(i)
+                    if header is not None:
+                        events.append(("header", header))
+                elif ch == "{" and self._in_days and self._depth == 2:
+                    self._day_start = i
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._in_days and self._depth == 2 and self._day_start is not None:
+                    day = self._loads(text[self._day_start:i + 1])
+                    if day is not None:
+                        events.append(("day", day))
+                    self._day_start = None
+                elif ch == "]" and self._in_days and self._depth == 1:
+                    self._in_days = False
+
+        return events
+
+    def _parse_header(self, days_bracket: int) -> Optional[Dict[str, Any]]:
+        """Close the root object just before the "days" key and parse it."""
+        prefix = self.text[self._root_start:days_bracket]
+        prefix = prefix[:prefix.rfind('"days"')].rstrip().rstrip(",")
+        header = self._loads(prefix + "}")
+        if header is not None:
+            self.header_sent = True
+        return header
+
+    @staticmethod
+    def _loads(fragment: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = json.loads(fragment)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
@@ -3,14 +3,56 @@ Google Maps Directions / Distance Matrix Service
 Used for route planning and travel time estimates.
 """
 
-import httpx
-from typing import Dict, Any, Optional, List
+import asyncio
+import re
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 from app.config import settings
+from app.models import PlaceInfo
+from app.services import persistent_cache
+from app.services.autocomplete_index import normalize_text
+from app.services.circuit_breaker import shared_call, track_stale
+from app.services.http_client import get_json
+from app.services.memory_cache import NamespacedCache
+from app.services.singleflight import SingleFlight
 
 DIRECTIONS_URL = "https://maps.googleapis.com/maps/api/directions/json"
 DISTANCE_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
 GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
+# Coalesce identical lookups that are in flight at the same time
+_directions_flight = SingleFlight("directions")
+_geocode_flight = SingleFlight("geocode")
+
+# Address -> coordinates, in process and (longer-lived) in the persistent cache
+_geocode_cache = NamespacedCache({
+    "addresses": (settings.GEOCODE_CACHE_MAX_BYTES, settings.GEOCODE_CACHE_FRESH_SECONDS),
+})
+_geocode_semaphore = asyncio.Semaphore(settings.GEOCODE_CONCURRENCY)
+_geocode_stats: Dict[str, int] = {"requests": 0, "upstream": 0, "seeded": 0}
+_seed_tasks: set = set()
+
+# Directions accepts up to 25 intermediate waypoints per request
+DIRECTIONS_MAX_WAYPOINTS = 25
+
+# Per-leg route cache for whole-day routes
+_route_cache = NamespacedCache({
+    "legs": (settings.ROUTE_LEG_CACHE_MAX_BYTES, settings.ROUTE_LEG_CACHE_TTL),
+})
+_route_stats: Dict[str, int] = {"legs_requested": 0, "legs_from_cache": 0, "upstream_calls": 0}
+
+# Distance Matrix request limits: 25 origins or destinations, 100 elements,
+# and a URL budget per side comfortably under the 16k character cap
+MATRIX_MAX_SIDE = 25
+MATRIX_MAX_ELEMENTS = 100
+MATRIX_MAX_PARAM_CHARS = 6000
+
+# Per-pair element cache, shared across requests
+_matrix_cache = NamespacedCache({
+    "pairs": (settings.DISTANCE_CACHE_MAX_BYTES, settings.DISTANCE_CACHE_TTL),
+})
+_matrix_semaphore = asyncio.Semaphore(settings.DISTANCE_MATRIX_CONCURRENCY)
+_matrix_stats: Dict[str, int] = {"elements_requested": 0, "elements_from_cache": 0, "tiles_fetched": 0}
+
 
 async def get_directions(
     origin: str,
@@ -18,6 +60,15 @@ async def get_directions(
     mode: str = "driving",
 ) -> Optional[Dict[str, Any]]:
     """Get directions between two places."""
+    return await shared_call(
+        _directions_flight,
+        f"{origin}:{destination}:{mode}",
+        lambda: _fetch_directions(origin, destination, mode),
+    )
+
+
+async def _fetch_directions(origin: str, destination: str, mode: str) -> Optional[Dict[str, Any]]:
+    """Call the Directions API and summarize the first route."""
     params = {
         "origin": origin,
         "destination": destination,
@@ -25,9 +76,7 @@ async def get_directions(
         "key": settings.GOOGLE_MAPS_API_KEY,
     }
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        response = await client.get(DIRECTIONS_URL, params=params)
-        data = response.json()
+    data = await get_json("directions", DIRECTIONS_URL, params)
 
     if data.get("status") != "OK":
         return None
@@ -53,39 +102,399 @@ async def get_directions(
     }
 
 
-async def get_distance_matrix(
-    origins: List[str],
-    destinations: List[str],
-    mode: str = "driving",
-) -> Optional[Dict[str, Any]]:
-    """Get distance matrix between multiple origins and destinations."""
+def place_to_stop(place: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Most precise Directions location for a PlaceInfo dict: place id, lat/lng, then text."""
+    if not place:
+        return None
+    if place.get("place_id"):
+        return f"place_id:{place['place_id']}"
+    if place.get("latitude") is not None and place.get("longitude") is not None:
+        return f"{place['latitude']},{place['longitude']}"
+    text = ", ".join(part for part in (place.get("name"), place.get("address")) if part)
+    return text or None
+
+
+def decode_polyline(encoded: str) -> List[Tuple[float, float]]:
+    """Decode a Google encoded polyline into (lat, lng) points."""
+    points: List[Tuple[float, float]] = []
+    index = lat = lng = 0
+    while index < len(encoded):
+        deltas = []
+        for _ in range(2):
+            shift = result = 0
+            while True:
+                byte = ord(encoded[index]) - 63
+                index += 1
+                result |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            deltas.append(~(result >> 1) if result & 1 else result >> 1)
+        lat += deltas[0]
+        lng += deltas[1]
+        points.append((lat / 1e5, lng / 1e5))
+    return points
+
+
+def encode_polyline(points: List[Tuple[float, float]]) -> str:
+    """Encode (lat, lng) points as a Google encoded polyline."""
+    chunks = []
+    prev_lat = prev_lng = 0
+    for lat, lng in points:
+        lat_e5, lng_e5 = int(round(lat * 1e5)), int(round(lng * 1e5))
+        for delta in (lat_e5 - prev_lat, lng_e5 - prev_lng):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            chunks.append(chr(value + 63))
+        prev_lat, prev_lng = lat_e5, lng_e5
+    return "".join(chunks)
+
+
+def _join_points(parts: List[List[Tuple[float, float]]]) -> List[Tuple[float, float]]:
+    """Concatenate consecutive point lists, dropping the shared joint."""
+    points: List[Tuple[float, float]] = []
+    for part in parts:
+        if points and part and points[-1] == part[0]:
+            part = part[1:]
+        points.extend(part)
+    return points
+
+
+def _summarize_leg(leg: Dict[str, Any]) -> Dict[str, Any]:
+    steps = leg.get("steps", [])
+    points = _join_points([decode_polyline(step.get("polyline", {}).get("points", "")) for step in steps])
+    return {
+        "status": "OK",
+        "start_address": leg.get("start_address", ""),
+        "end_address": leg.get("end_address", ""),
+        "distance": leg.get("distance", {}).get("text", ""),
+        "duration": leg.get("duration", {}).get("text", ""),
+        "distance_m": leg.get("distance", {}).get("value", 0),
+        "duration_s": leg.get("duration", {}).get("value", 0),
+        "polyline": encode_polyline(points),
+        "steps": [
+            {
+                "instruction": step.get("html_instructions", ""),
+                "distance": step.get("distance", {}).get("text", ""),
+                "duration": step.get("duration", {}).get("text", ""),
+            }
+            for step in steps
+        ],
+    }
+
+
+async def _fetch_route_chunk(stops: List[str], mode: str) -> Optional[List[Dict[str, Any]]]:
+    """One Directions call through stops in order; returns one summary per leg."""
+    params = {
+        "origin": stops[0],
+        "destination": stops[-1],
+        "mode": mode,
+        "key": settings.GOOGLE_MAPS_API_KEY,
+    }
+    if len(stops) > 2:
+        params["waypoints"] = "|".join(stops[1:-1])
+
+    data = await get_json("directions", DIRECTIONS_URL, params)
+    _route_stats["upstream_calls"] += 1
+
+    if data.get("status") != "OK" or not data.get("routes"):
+        print(f"Directions API error: {data.get('status')} - {data.get('error_message', '')}")
+        return None
+
+    legs = data["routes"][0].get("legs", [])
+    if len(legs) != len(stops) - 1:
+        return None
+    return [_summarize_leg(leg) for leg in legs]
+
+
+async def get_day_route(stops: List[str], mode: str = "driving") -> Optional[Dict[str, Any]]:
+    """
+    Route through an ordered list of stops. Cached legs are reused; each run of
+    uncached legs is fetched with waypoints, in as few Directions calls as the
+    waypoint limit allows (transit has no waypoints, so it goes leg by leg).
+    Returns per-leg summaries, totals and one encoded polyline for the day.
+    """
+    if len(stops) < 2:
+        return None
+
+    leg_count = len(stops) - 1
+    legs: List[Optional[Dict[str, Any]]] = [
+        _route_cache.get("legs", _pair_key(stops[k], stops[k + 1], mode)) for k in range(leg_count)
+    ]
+    _route_stats["legs_requested"] += leg_count
+    _route_stats["legs_from_cache"] += sum(leg is not None for leg in legs)
+
+    # Contiguous runs of missing legs, split to fit the per-request waypoint limit
+    max_legs = 1 if mode == "transit" else DIRECTIONS_MAX_WAYPOINTS + 1
+    chunks: List[Tuple[int, int]] = []
+    k = 0
+    while k < leg_count:
+        if legs[k] is not None:
+            k += 1
+            continue
+        end = k
+        while end < leg_count and legs[end] is None and end - k < max_legs:
+            end += 1
+        chunks.append((k, end))
+        k = end
+
+    if chunks:
+        with track_stale() as stale:
+            results = await asyncio.gather(*[
+                shared_call(
+                    _directions_flight,
+                    f"route:{mode}:" + "|".join(stops[start:end + 1]),
+                    lambda start=start, end=end: _fetch_route_chunk(stops[start:end + 1], mode),
+                )
+                for start, end in chunks
+            ])
+        for (start, end), fetched in zip(chunks, results):
+            if fetched is None:
+                continue
+            for offset, leg in enumerate(fetched):
+                legs[start + offset] = leg
+                if not stale.stale:
+                    key = _pair_key(stops[start + offset], stops[start + offset + 1], mode)
+                    _route_cache.set("legs", key, leg)
+
+    if all(leg is None for leg in legs):
+        return None
+
+    legs = [leg if leg is not None else {"status": "NOT_FOUND"} for leg in legs]
+    found = [leg for leg in legs if leg["status"] == "OK"]
+    return {
+        "mode": mode,
+        "stops": stops,
+        "legs": legs,
+        "total_distance_m": sum(leg["distance_m"] for leg in found),
+        "total_duration_s": sum(leg["duration_s"] for leg in found),
+        "polyline": encode_polyline(_join_points([decode_polyline(leg["polyline"]) for leg in found])),
+        "upstream_calls": len(chunks),
+    }
+
+
+def route_stats() -> Dict[str, Any]:
+    return {**_route_stats, "cache": _route_cache.stats()["legs"]}
+
+
+def _pair_key(origin: str, destination: str, mode: str) -> str:
+    return f"{mode}|{origin}|{destination}"
+
+
+def _cached_element(origin: str, destination: str, mode: str) -> Optional[Dict[str, Any]]:
+    element = _matrix_cache.get("pairs", _pair_key(origin, destination, mode))
+    if element is None and mode == "walking":
+        # Walking times are effectively symmetric, so reuse the reverse pair
+        element = _matrix_cache.get("pairs", _pair_key(destination, origin, mode))
+    return element
+
+
+def _plan_tiles(origins: List[int], destinations: List[int],
+                labels_o: List[str], labels_d: List[str]) -> List[Tuple[List[int], List[int]]]:
+    """Split origins x destinations into tiles within the API's per-request limits."""
+    cols = min(len(destinations), MATRIX_MAX_SIDE)
+    rows = min(len(origins), MATRIX_MAX_SIDE, max(MATRIX_MAX_ELEMENTS // cols, 1))
+
+    def too_long(indices: List[int], labels: List[str]) -> bool:
+        return sum(len(labels[i]) + 1 for i in indices) > MATRIX_MAX_PARAM_CHARS
+
+    tiles = []
+    for r in range(0, len(origins), rows):
+        row_block = origins[r:r + rows]
+        for c in range(0, len(destinations), cols):
+            col_block = destinations[c:c + cols]
+            # Long addresses can exceed the URL limit before the element limit
+            pending = [(row_block, col_block)]
+            while pending:
+                o_block, d_block = pending.pop()
+                if too_long(o_block, labels_o) and len(o_block) > 1:
+                    half = len(o_block) // 2
+                    pending += [(o_block[:half], d_block), (o_block[half:], d_block)]
+                elif too_long(d_block, labels_d) and len(d_block) > 1:
+                    half = len(d_block) // 2
+                    pending += [(o_block, d_block[:half]), (o_block, d_block[half:])]
+                else:
+                    tiles.append((o_block, d_block))
+    return tiles
+
+
+def _group_missing(missing: List[Tuple[int, int]]) -> List[Tuple[List[int], List[int]]]:
+    """
+    Cover the missing cells exactly with rows x columns blocks: rows that miss the
+    same set of columns share a block (or columns with the same rows, if that
+    gives fewer blocks), so cached pairs are never fetched again.
+    """
+    def group(cells: List[Tuple[int, int]]) -> List[Tuple[List[int], List[int]]]:
+        by_key: Dict[int, List[int]] = {}
+        for key, value in cells:
+            by_key.setdefault(key, []).append(value)
+        blocks: Dict[Tuple[int, ...], List[int]] = {}
+        for key, values in by_key.items():
+            blocks.setdefault(tuple(sorted(values)), []).append(key)
+        return [(sorted(keys), list(values)) for values, keys in blocks.items()]
+
+    by_rows = group(missing)
+    by_cols = [(rows, cols) for cols, rows in group([(j, i) for i, j in missing])]
+    return by_rows if len(by_rows) <= len(by_cols) else by_cols
+
+
+async def _fetch_matrix_tile(origins: List[str], destinations: List[str], mode: str) -> Optional[Dict[str, Any]]:
     params = {
         "origins": "|".join(origins),
         "destinations": "|".join(destinations),
         "mode": mode,
         "key": settings.GOOGLE_MAPS_API_KEY,
     }
-
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        response = await client.get(DISTANCE_URL, params=params)
-        data = response.json()
+    async with _matrix_semaphore:
+        # Distance Matrix quotas count elements, not requests
+        data = await get_json("distancematrix", DISTANCE_URL, params, cost=len(origins) * len(destinations))
+    _matrix_stats["tiles_fetched"] += 1
 
     if data.get("status") != "OK":
+        print(f"Distance Matrix API error: {data.get('status')} - {data.get('error_message', '')}")
         return None
-
     return data
 
 
+async def get_distance_matrix(
+    origins: List[str],
+    destinations: List[str],
+    mode: str = "driving",
+) -> Optional[Dict[str, Any]]:
+    """
+    Get distance matrix between multiple origins and destinations.
+    Any N x M size is split into tiles within the API limits and fetched
+    concurrently; each (origin, destination, mode) element is cached and reused.
+    Returns the API's response shape plus dense `durations` (s) and `distances` (m).
+    Pairs that could not be fetched are UNKNOWN_ERROR elements (None in the
+    dense arrays) and counted in `missing_elements`; None only if no pair is known.
+    """
+    if not origins or not destinations:
+        return None
+
+    n, m = len(origins), len(destinations)
+    elements: List[List[Optional[Dict[str, Any]]]] = [
+        [_cached_element(origins[i], destinations[j], mode) for j in range(m)] for i in range(n)
+    ]
+    missing = [(i, j) for i in range(n) for j in range(m) if elements[i][j] is None]
+    _matrix_stats["elements_requested"] += n * m
+    _matrix_stats["elements_from_cache"] += n * m - len(missing)
+
+    origin_addresses = list(origins)
+    destination_addresses = list(destinations)
+
+    if missing:
+        tiles = [
+            tile
+            for rows, cols in _group_missing(missing)
+            for tile in _plan_tiles(rows, cols, origins, destinations)
+        ]
+        with track_stale() as stale:
+            results = await asyncio.gather(*[
+                _fetch_matrix_tile([origins[i] for i in o_block], [destinations[j] for j in d_block], mode)
+                for o_block, d_block in tiles
+            ])
+
+        for (o_block, d_block), data in zip(tiles, results):
+            if data is None:
+                continue
+            for a, i in enumerate(o_block):
+                if a < len(data.get("origin_addresses", [])):
+                    origin_addresses[i] = data["origin_addresses"][a]
+                row = data.get("rows", [])[a]["elements"] if a < len(data.get("rows", [])) else []
+                for b, j in enumerate(d_block):
+                    if b < len(data.get("destination_addresses", [])):
+                        destination_addresses[j] = data["destination_addresses"][b]
+                    if b >= len(row):
+                        continue
+                    element = row[b]
+                    elements[i][j] = element
+                    if element.get("status") == "OK" and not stale.stale:
+                        _matrix_cache.set("pairs", _pair_key(origins[i], destinations[j], mode), element)
+
+    unknown = sum(element is None for row in elements for element in row)
+    if unknown == n * m:
+        return None
+    for i in range(n):
+        for j in range(m):
+            if elements[i][j] is None:
+                elements[i][j] = {"status": "UNKNOWN_ERROR"}
+
+    return {
+        "status": "OK",
+        "missing_elements": unknown,
+        "origin_addresses": origin_addresses,
+        "destination_addresses": destination_addresses,
+        "rows": [{"elements": row} for row in elements],
+        "durations": [[e.get("duration", {}).get("value") for e in row] for row in elements],
+        "distances": [[e.get("distance", {}).get("value") for e in row] for row in elements],
+    }
+
+
+def distance_matrix_stats() -> Dict[str, Any]:
+    return {**_matrix_stats, "cache": _matrix_cache.stats()["pairs"]}
+
+
+def normalize_address(address: str) -> str:
+    """Cache key for an address: casefolded, accent-free, consistent comma spacing, no periods."""
+    text = normalize_text(address).replace(".", "")
+    return re.sub(r"\s*,\s*", ", ", text).strip(" ,")
+
+
 async def geocode(address: str) -> Optional[Dict[str, float]]:
-    """Get latitude/longitude for an address."""
+    """Get latitude/longitude for an address (cached by normalized address)."""
+    key = normalize_address(address)
+    if not key:
+        return None
+    _geocode_stats["requests"] += 1
+
+    cached = _geocode_cache.get("addresses", key)
+    if cached is not None:
+        return cached
+
+    store_key = f"geocode:{key}"
+
+    async def refresh() -> Optional[Dict[str, float]]:
+        with track_stale() as stale:
+            location = await _fetch_geocode(address)
+        if location is not None and not stale.stale:
+            _geocode_cache.set("addresses", key, location)
+            await persistent_cache.cache_set(store_key, location, settings.GEOCODE_CACHE_FRESH_SECONDS)
+        return location
+
+    async def load() -> Optional[Dict[str, float]]:
+        stored = await persistent_cache.cache_get(store_key)
+        if stored is None:
+            return await refresh()
+        location, stale = stored
+        _geocode_cache.set("addresses", key, location)
+        if stale:
+            persistent_cache.schedule_refresh(store_key, refresh)
+        return location
+
+    return await shared_call(_geocode_flight, key, load)
+
+
+async def geocode_many(addresses: List[str]) -> List[Optional[Dict[str, float]]]:
+    """Geocode a batch concurrently; duplicates share one lookup and upstream calls stay bounded."""
+    unique = {normalize_address(a): a for a in addresses}
+    results = await asyncio.gather(*[geocode(a) for a in unique.values()])
+    by_key = dict(zip(unique.keys(), results))
+    return [by_key[normalize_address(a)] for a in addresses]
+
+
+async def _fetch_geocode(address: str) -> Optional[Dict[str, float]]:
+    """Call the Geocoding API for a single address."""
     params = {
         "address": address,
         "key": settings.GOOGLE_MAPS_API_KEY,
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(GEOCODE_URL, params=params)
-        data = response.json()
+    async with _geocode_semaphore:
+        data = await get_json("geocode", GEOCODE_URL, params)
+    _geocode_stats["upstream"] += 1
 
     if data.get("status") != "OK" or not data.get("results"):
         return None
@@ -96,3 +505,37 @@ async def geocode(address: str) -> Optional[Dict[str, float]]:
         "lng": location["lng"],
         "formatted_address": data["results"][0].get("formatted_address", ""),
     }
+
+
+def seed_geocode_cache(places: Iterable[PlaceInfo]):
+    """
+    Record coordinates we already have from Places results, keyed by address
+    and "name, address", so geocoding known places never calls upstream.
+    New keys are written to the persistent cache in the background.
+    """
+    new_entries = {}
+    for place in places:
+        if place.latitude is None or place.longitude is None or not place.address:
+            continue
+        location = {"lat": place.latitude, "lng": place.longitude, "formatted_address": place.address}
+        for text in (place.address, f"{place.name}, {place.address}"):
+            key = normalize_address(text)
+            if key and key not in new_entries and not _geocode_cache.contains("addresses", key):
+                _geocode_cache.set("addresses", key, location)
+                new_entries[key] = location
+
+    if not new_entries:
+        return
+    _geocode_stats["seeded"] += len(new_entries)
+
+    async def persist():
+        for key, location in new_entries.items():
+            await persistent_cache.cache_set(f"geocode:{key}", location, settings.GEOCODE_CACHE_FRESH_SECONDS)
+
+    task = asyncio.ensure_future(persist())
+    _seed_tasks.add(task)
+    task.add_done_callback(_seed_tasks.discard)
+
+
+def geocode_stats() -> Dict[str, Any]:
+    return {**_geocode_stats, "cache": _geocode_cache.stats()["addresses"]}
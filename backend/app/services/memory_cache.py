@@ -0,0 +1,116 @@
+"""
+Namespaced In-Memory Cache
+LRU cache split into namespaces, each with its own byte budget and TTL, so a
+few large payloads in one namespace can't push out entries in another.
+Sizes are measured as the JSON-encoded length of each value.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic_core import to_json
+
+
+def _estimate_size(value: Any) -> int:
+    try:
+        return len(to_json(value))
+    except Exception:
+        return len(repr(value))
+
+
+class _Namespace:
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def remove(self, key: str):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+
+
+class NamespacedCache:
+    """Byte-budgeted LRU/TTL cache with per-namespace hit, miss and eviction counters."""
+
+    def __init__(self, namespaces: Dict[str, Tuple[int, float]]):
+        self._namespaces = {
+            name: _Namespace(max_bytes, ttl) for name, (max_bytes, ttl) in namespaces.items()
+        }
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        ns = self._namespaces[namespace]
+        entry = ns.entries.get(key)
+        if entry is None:
+            ns.misses += 1
+            return default
+
+        value, _, expires_at = entry
+        if expires_at <= time.monotonic():
+            ns.remove(key)
+            ns.expirations += 1
+            ns.misses += 1
+            return default
+
+        ns.entries.move_to_end(key)
+        ns.hits += 1
+        return value
+
+    def contains(self, namespace: str, key: str) -> bool:
+        """Whether a live entry exists, without counting a hit/miss or refreshing its LRU position."""
+        entry = self._namespaces[namespace].entries.get(key)
+        return entry is not None and entry[2] > time.monotonic()
+
+    def set(self, namespace: str, key: str, value: Any):
+        ns = self._namespaces[namespace]
+        size = _estimate_size(value)
+        if key in ns.entries:
+            ns.remove(key)
+        if size > ns.max_bytes:
+            # Larger than the whole budget — caching it would only flush the namespace
+            ns.rejected += 1
+            return
+
+        while ns.entries and ns.bytes + size > ns.max_bytes:
+            oldest = next(iter(ns.entries))
+            ns.remove(oldest)
+            ns.evictions += 1
+
+        ns.entries[key] = (value, size, time.monotonic() + ns.ttl)
+        ns.bytes += size
+
+    def delete(self, namespace: str, key: str):
+        ns = self._namespaces[namespace]
+        if key in ns.entries:
+            ns.remove(key)
+
+    def clear(self, namespace: Optional[str] = None):
+        names = [namespace] if namespace else list(self._namespaces)
+        for name in names:
+            ns = self._namespaces[name]
+            ns.entries.clear()
+            ns.bytes = 0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name, ns in self._namespaces.items():
+            lookups = ns.hits + ns.misses
+            result[name] = {
+                "entries": len(ns.entries),
+                "bytes": ns.bytes,
+                "max_bytes": ns.max_bytes,
+                "ttl": ns.ttl,
+                "hits": ns.hits,
+                "misses": ns.misses,
+                "hit_rate": round(ns.hits / lookups, 4) if lookups else 0.0,
+                "evictions": ns.evictions,
+                "expirations": ns.expirations,
+                "rejected": ns.rejected,
+            }
+        return result
@@ -0,0 +1,127 @@
+"""
+Prometheus Metrics
+Latency histograms for each trip generation stage and every outbound Google
+call, prompt sizes, in-flight LLM calls and event-loop lag. Exposed on /metrics together
+with cache hit counters collected from the services' own stats.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Optional, TypeVar
+
+from prometheus_client import Gauge, Histogram
+
+GENERATION_STAGES = ("places_fetch", "prompt_format", "llm", "parse_validate", "db_insert")
+
+GENERATION_STAGE_SECONDS = Histogram(
+    "tripstellar_generation_stage_seconds",
+    "Time spent in each trip generation stage",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+OUTBOUND_REQUEST_SECONDS = Histogram(
+    "tripstellar_outbound_request_seconds",
+    "Google Maps Platform call latency by API and response status",
+    ["api", "status"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20),
+)
+OUTBOUND_QUEUE_WAIT_SECONDS = Histogram(
+    "tripstellar_outbound_queue_wait_seconds",
+    "Time a Google call waited for its API's rate-limit token, by priority",
+    ["api", "priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 60),
+)
+CIRCUIT_STATE = Gauge(
+    "tripstellar_circuit_state",
+    "Google API circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["api"],
+)
+PROMPT_INPUT_TOKENS = Histogram(
+    "tripstellar_prompt_input_tokens",
+    "Estimated input tokens per generation prompt, in total and for the place tables",
+    ["part"],
+    buckets=(250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000, 32000),
+)
+LLM_IN_FLIGHT = Gauge("tripstellar_llm_in_flight", "LLM calls currently awaiting a response")
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "tripstellar_event_loop_lag_seconds",
+    "How late the event loop wakes a timer (sampled every LOOP_LAG_INTERVAL)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+T = TypeVar("T")
+
+_CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+LOOP_LAG_INTERVAL = 0.25
+_loop_monitor: Optional[asyncio.Task] = None
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Observe the duration of a generation stage, including ones that raise."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        GENERATION_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - started)
+
+
+async def time_stage_iter(stage: str, iterator: AsyncIterator[T]) -> AsyncIterator[T]:
+    """
+    Re-yield `iterator`, observing as `stage` only the time spent waiting on it,
+    not the time the consumer holds each item (e.g. a slow SSE client).
+    """
+    waited = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                waited += time.perf_counter() - started
+            yield item
+    finally:
+        GENERATION_STAGE_SECONDS.labels(stage).observe(waited)
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+def observe_outbound(api: str, status: str, seconds: float):
+    OUTBOUND_REQUEST_SECONDS.labels(api, status).observe(seconds)
+
+
+def observe_queue_wait(api: str, priority: str, seconds: float):
+    OUTBOUND_QUEUE_WAIT_SECONDS.labels(api, priority).observe(seconds)
+
+
+def observe_prompt_tokens(input_tokens: int, places_tokens: int):
+    PROMPT_INPUT_TOKENS.labels("total").observe(input_tokens)
+    PROMPT_INPUT_TOKENS.labels("places").observe(places_tokens)
+
+
+def set_circuit_state(api: str, state: str):
+    CIRCUIT_STATE.labels(api).set(_CIRCUIT_STATE_VALUES[state])
+
+
+async def _monitor_loop_lag():
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        EVENT_LOOP_LAG_SECONDS.observe(max(time.perf_counter() - started - LOOP_LAG_INTERVAL, 0.0))
+
+
+def start_loop_monitor():
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = asyncio.create_task(_monitor_loop_lag())
+
+
+async def stop_loop_monitor():
+    global _loop_monitor
+    if _loop_monitor is not None:
+        _loop_monitor.cancel()
+        await asyncio.gather(_loop_monitor, return_exceptions=True)
+        _loop_monitor = None
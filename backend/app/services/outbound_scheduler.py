@@ -0,0 +1,221 @@
+"""
+Outbound Request Scheduler
+Per-API token buckets sized to our Google quotas, so a burst of generations is
+spread out at the quota ceiling instead of tripping OVER_QUERY_LIMIT. Callers
+waiting for a token are served by priority (interactive, then job-queue work,
+then background refresh), and every call carries a deadline that bounds both
+the wait and any retries. Used by http_client.get_json.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.metrics import observe_queue_wait
+
+INTERACTIVE = 0
+BATCH = 1
+BACKGROUND = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch", BACKGROUND: "background"}
+
+# Google statuses worth another attempt; everything else (ZERO_RESULTS, REQUEST_DENIED...) is final
+RETRYABLE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+_priority: ContextVar[int] = ContextVar("outbound_priority", default=INTERACTIVE)
+_deadline: ContextVar[Optional[float]] = ContextVar("outbound_deadline", default=None)
+
+
+class TokenBucket:
+    """Refills at `rate` tokens/s up to `burst`; waiters are granted tokens in priority order."""
+
+    def __init__(self, name: str, rate: float, burst: float):
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.granted = 0
+        self.waited = 0
+        self.timed_out = 0
+        self.penalties = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, cost: float, priority: int, deadline: float) -> bool:
+        """Take `cost` tokens, waiting behind higher-priority callers; False if the deadline passes first."""
+        cost = min(cost, self.burst)
+        self._refill()
+        if not self._waiters and self.tokens >= cost:
+            self.tokens -= cost
+            self.granted += 1
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), cost, future))
+        self.waited += 1
+        self._schedule()
+        try:
+            await asyncio.wait_for(future, timeout=max(deadline - time.monotonic(), 0))
+            return True
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            return False
+        finally:
+            # A cancelled head waiter may have been what the timer was sized for
+            self._schedule()
+
+    def penalize(self):
+        """Google said OVER_QUERY_LIMIT: drop the saved-up burst so we pause for a refill."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+        self.penalties += 1
+
+    def _schedule(self):
+        while self._waiters and self._waiters[0][3].done():
+            heapq.heappop(self._waiters)
+        if self._wakeup is not None or not self._waiters:
+            return
+        self._refill()
+        delay = max((self._waiters[0][2] - self.tokens) / self.rate, 0.0)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self):
+        self._wakeup = None
+        self._refill()
+        while self._waiters:
+            _, _, cost, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.tokens < cost:
+                break
+            heapq.heappop(self._waiters)
+            self.tokens -= cost
+            self.granted += 1
+            future.set_result(None)
+        self._schedule()
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "waiting": sum(1 for w in self._waiters if not w[3].done()),
+            "granted": self.granted,
+            "waited": self.waited,
+            "timed_out": self.timed_out,
+            "penalties": self.penalties,
+        }
+
+
+def _endpoint_rates() -> Dict[str, float]:
+    """Quota per Google endpoint in requests/s (Distance Matrix: elements/s); 0 = unlimited."""
+    return {
+        "textsearch": settings.GOOGLE_RATE_PLACES_SEARCH,
+        "details": settings.GOOGLE_RATE_PLACES_DETAILS,
+        "autocomplete": settings.GOOGLE_RATE_AUTOCOMPLETE,
+        "directions": settings.GOOGLE_RATE_DIRECTIONS,
+        "distancematrix": settings.GOOGLE_RATE_DISTANCE_MATRIX_ELEMENTS,
+        "geocode": settings.GOOGLE_RATE_GEOCODE,
+    }
+
+
+_buckets: Dict[str, Optional[TokenBucket]] = {}
+_stats: Dict[str, int] = {"retries": 0, "gave_up": 0, "throttled": 0}
+
+
+def _bucket(endpoint: str) -> Optional[TokenBucket]:
+    if endpoint not in _buckets:
+        rate = _endpoint_rates().get(endpoint, 0.0)
+        _buckets[endpoint] = (
+            TokenBucket(endpoint, rate, rate * settings.GOOGLE_RATE_BURST_SECONDS) if rate > 0 else None
+        )
+    return _buckets[endpoint]
+
+
+@contextmanager
+def outbound_priority(priority: int):
+    """Run Google calls made inside this block (and tasks it starts) at the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def outbound_deadline(seconds: float):
+    """Bound Google calls made inside this block to finish within `seconds` (nested blocks only tighten)."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float:
+    """Absolute (monotonic) deadline for a call starting now."""
+    deadline = _deadline.get()
+    if deadline is not None:
+        return deadline
+    budget = (
+        settings.OUTBOUND_BACKGROUND_DEADLINE_SECONDS if _priority.get() == BACKGROUND
+        else settings.OUTBOUND_DEADLINE_SECONDS
+    )
+    return time.monotonic() + budget
+
+
+async def acquire(endpoint: str, cost: float, deadline: float) -> bool:
+    """Wait for quota on endpoint's bucket at the caller's priority; False if the deadline passes."""
+    bucket = _bucket(endpoint)
+    if bucket is None:
+        return True
+    priority = _priority.get()
+    started = time.monotonic()
+    granted = await bucket.acquire(cost, priority, deadline)
+    observe_queue_wait(endpoint, PRIORITY_NAMES[priority], time.monotonic() - started)
+    if not granted:
+        _stats["throttled"] += 1
+    return granted
+
+
+def penalize(endpoint: str):
+    bucket = _bucket(endpoint)
+    if bucket is not None:
+        bucket.penalize()
+
+
+def backoff_delay(attempt: int, deadline: float) -> Optional[float]:
+    """Full-jitter exponential backoff before retry number `attempt`, or None to give up."""
+    if attempt > settings.OUTBOUND_MAX_RETRIES:
+        _stats["gave_up"] += 1
+        return None
+    cap = min(settings.OUTBOUND_BACKOFF_MAX, settings.OUTBOUND_BACKOFF_BASE * 2 ** (attempt - 1))
+    delay = random.uniform(0, cap)
+    if time.monotonic() + delay >= deadline:
+        _stats["gave_up"] += 1
+        return None
+    _stats["retries"] += 1
+    return delay
+
+
+def scheduler_stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "buckets": {name: bucket.stats() for name, bucket in _buckets.items() if bucket is not None},
+    }
@@ -0,0 +1,204 @@
+"""
+Persistent Places Cache
+Second cache tier behind the in-process cache in places_service. Entries survive
+restarts and are shared across instances (MongoDB collection with a TTL index),
+or live in a local SQLite file for single-node setups. Entries past their fresh
+window are still served while a background task refreshes them.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.database import get_db
+from app.services.outbound_scheduler import BACKGROUND, outbound_priority
+
+_store = None
+_refreshing: Set[str] = set()
+_refresh_tasks: Set[asyncio.Task] = set()
+_stats: Dict[str, int] = {"hits": 0, "stale_hits": 0, "misses": 0, "writes": 0, "refreshes": 0, "errors": 0}
+
+
+class MongoCacheStore:
+    """Cache entries in the `place_cache` collection (TTL index on expires_at)."""
+
+    name = "mongo"
+
+    async def setup(self):
+        pass
+
+    async def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        doc = await get_db().place_cache.find_one({"_id": key})
+        if not doc:
+            return None
+        expires_at = doc["expires_at"].replace(tzinfo=timezone.utc).timestamp()
+        if expires_at <= time.time():
+            # The TTL monitor only sweeps once a minute
+            return None
+        return doc["value"], doc["fresh_until"].replace(tzinfo=timezone.utc).timestamp()
+
+    async def set(self, key: str, value: Any, fresh_until: float, expires_at: float):
+        await get_db().place_cache.replace_one(
+            {"_id": key},
+            {
+                "_id": key,
+                "value": value,
+                "fresh_until": datetime.fromtimestamp(fresh_until, timezone.utc),
+                "expires_at": datetime.fromtimestamp(expires_at, timezone.utc),
+            },
+            upsert=True,
+        )
+
+    async def close(self):
+        pass
+
+
+class SQLiteCacheStore:
+    """Cache entries in a local SQLite file; queries run in a worker thread."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _execute(self, sql: str, args: tuple = ()) -> list:
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+            self._conn.commit()
+            return rows
+
+    async def setup(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        await asyncio.to_thread(
+            self._execute,
+            "CREATE TABLE IF NOT EXISTS place_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "fresh_until REAL NOT NULL, expires_at REAL NOT NULL)",
+        )
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM place_cache WHERE expires_at <= ?", (time.time(),)
+        )
+
+    async def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT value, fresh_until FROM place_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        )
+        if not rows:
+            return None
+        return json.loads(rows[0][0]), rows[0][1]
+
+    async def set(self, key: str, value: Any, fresh_until: float, expires_at: float):
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO place_cache (key, value, fresh_until, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), fresh_until, expires_at),
+        )
+
+    async def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+async def init_persistent_cache():
+    """Open the configured second-tier store (PLACE_CACHE_BACKEND)."""
+    global _store
+    backend = settings.PLACE_CACHE_BACKEND.lower()
+    if backend == "mongo":
+        _store = MongoCacheStore()
+    elif backend == "sqlite":
+        _store = SQLiteCacheStore(settings.PLACE_CACHE_SQLITE_PATH)
+    else:
+        _store = None
+        return
+
+    await _store.setup()
+    print(f"🗄️  Persistent places cache: {_store.name}")
+
+
+async def close_persistent_cache():
+    global _store
+    for task in list(_refresh_tasks):
+        task.cancel()
+    if _store is not None:
+        await _store.close()
+        _store = None
+
+
+async def cache_get(key: str) -> Optional[Tuple[Any, bool]]:
+    """Return (value, is_stale) for key, or None on a miss or store failure."""
+    if _store is None:
+        return None
+    try:
+        entry = await _store.get(key)
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"Persistent cache read failed: {e}")
+        return None
+
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+
+    value, fresh_until = entry
+    stale = fresh_until <= time.time()
+    _stats["stale_hits" if stale else "hits"] += 1
+    return value, stale
+
+
+async def cache_set(key: str, value: Any, fresh_seconds: Optional[float] = None):
+    """Store a JSON-serializable value with the configured (or given) fresh/stale windows."""
+    if _store is None:
+        return
+    now = time.time()
+    fresh_seconds = fresh_seconds if fresh_seconds is not None else settings.PLACE_CACHE_FRESH_SECONDS
+    try:
+        await _store.set(
+            key,
+            value,
+            fresh_until=now + fresh_seconds,
+            expires_at=now + fresh_seconds + settings.PLACE_CACHE_MAX_STALE_SECONDS,
+        )
+        _stats["writes"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"Persistent cache write failed: {e}")
+
+
+def schedule_refresh(key: str, refresh: Callable[[], Awaitable[Any]]):
+    """Refresh a stale key in the background, at most once at a time per key."""
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+    _stats["refreshes"] += 1
+
+    async def run():
+        try:
+            with outbound_priority(BACKGROUND):
+                await refresh()
+        except Exception as e:
+            print(f"Background refresh failed for {key!r}: {e}")
+        finally:
+            _refreshing.discard(key)
+
+    task = asyncio.ensure_future(run())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+def persistent_cache_stats() -> Dict[str, Any]:
+    return {
+        "backend": _store.name if _store is not None else "none",
+        "refreshing": len(_refreshing),
+        **_stats,
+    }
@@ -3,19 +3,95 @@ Google Places API Service
 Fetches high-rated spots, restaurants, and attractions using the GCP Places API.
 """
 
-import httpx
 import asyncio
-from typing import List, Optional, Dict, Any
-from cachetools import TTLCache
+import httpx
+from typing import List, Optional, Dict, Any, Awaitable, Callable
 
 from app.config import settings
+from app.database import get_db
 from app.models import PlaceInfo
-
-# Cache results for 1 hour to reduce API calls
-_place_cache = TTLCache(maxsize=500, ttl=3600)
+from app.services import persistent_cache
+from app.services.autocomplete_index import PrefixIndex, matches_prefix, normalize_text
+from app.services.circuit_breaker import shared_call, track_stale
+from app.services.geo_index import GeoIndex
+from app.services.http_client import get_json
+from app.services.maps_service import seed_geocode_cache
+from app.services.memory_cache import NamespacedCache
+from app.services.singleflight import SingleFlight
+
+# In-process cache: separate byte budgets and TTLs for search lists and detail payloads
+_place_cache = NamespacedCache({
+    "search": (settings.PLACE_CACHE_SEARCH_MAX_BYTES, settings.PLACE_CACHE_SEARCH_TTL),
+    "details": (settings.PLACE_CACHE_DETAILS_MAX_BYTES, settings.PLACE_CACHE_DETAILS_TTL),
+    "autocomplete": (settings.AUTOCOMPLETE_CACHE_MAX_BYTES, settings.AUTOCOMPLETE_CACHE_TTL),
+})
+_MISSING = object()
+
+# Spatial index over every place we have seen, for local nearby queries
+_geo_index = GeoIndex(cell_km=settings.GEO_INDEX_CELL_KM, max_places=settings.GEO_INDEX_MAX_PLACES)
+_geo_stats: Dict[str, int] = {"local_hits": 0, "upstream_fallbacks": 0}
+
+# Destination autocomplete: prefix index for "(cities)" lookups, seeded from past trips
+AUTOCOMPLETE_PAGE_SIZE = 5  # Google returns at most 5 predictions
+_autocomplete_index = PrefixIndex(max_entries=settings.AUTOCOMPLETE_INDEX_MAX_ENTRIES)
+_autocomplete_stats: Dict[str, int] = {"local_hits": 0, "cache_hits": 0, "prefix_reuse": 0, "upstream": 0}
+
+# Coalesce identical lookups that miss the cache at the same time
+_search_flight = SingleFlight("places_search")
+_details_flight = SingleFlight("places_details")
+_autocomplete_flight = SingleFlight("places_autocomplete")
 
 BASE_URL = "https://maps.googleapis.com/maps/api/place"
 
+# Statuses meaning Google couldn't answer right now (quota, outage), as opposed to no matches
+UNAVAILABLE_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR", "UNAVAILABLE"}
+
+
+class PlacesUnavailableError(Exception):
+    """Text Search failed for quota or availability reasons; the caller should retry later."""
+
+
+async def _cached_lookup(
+    namespace: str,
+    key: str,
+    flight: SingleFlight,
+    fetch: Callable[[], Awaitable[Optional[Any]]],
+    encode: Callable[[Any], Any] = lambda value: value,
+    decode: Callable[[Any], Any] = lambda value: value,
+) -> Optional[Any]:
+    """
+    Read through the in-process cache, then the persistent tier, then upstream.
+    fetch() returns None on API errors, which are never cached. Stale persistent
+    entries are served immediately and refreshed in the background.
+    """
+    value = _place_cache.get(namespace, key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    store_key = f"{namespace}:{key}"
+
+    async def refresh() -> Optional[Any]:
+        with track_stale() as stale:
+            value = await fetch()
+        # Circuit-breaker fallback data is served but not cached as fresh
+        if value is not None and not stale.stale:
+            _place_cache.set(namespace, key, value)
+            await persistent_cache.cache_set(store_key, encode(value))
+        return value
+
+    async def load() -> Optional[Any]:
+        stored = await persistent_cache.cache_get(store_key)
+        if stored is None:
+            return await refresh()
+        raw, stale = stored
+        value = decode(raw)
+        _place_cache.set(namespace, key, value)
+        if stale:
+            persistent_cache.schedule_refresh(store_key, refresh)
+        return value
+
+    return await shared_call(flight, key, load)
+
 
 async def search_places(
     query: str,
@@ -26,10 +102,67 @@ async def search_places(
     max_results: int = 10,
 ) -> List[PlaceInfo]:
     """Search for places using Google Places Text Search API."""
-    cache_key = f"{query}:{location}:{place_type}:{min_rating}"
-    if cache_key in _place_cache:
-        return _place_cache[cache_key]
+    places = await _cached_lookup(
+        "search",
+        f"{query}:{location}:{place_type}:{min_rating}",
+        _search_flight,
+        lambda: _fetch_search_places(query, location, radius, place_type, min_rating, max_results),
+        encode=lambda places: [p.model_dump() for p in places],
+        decode=lambda docs: [PlaceInfo(**d) for d in docs],
+    )
+    if places is None:
+        return []
+    _geo_index.add(places)
+    return places
+
+
+async def search_nearby(
+    lat: float,
+    lng: float,
+    radius_km: float = 2.0,
+    place_type: Optional[str] = None,
+    min_rating: float = 4.0,
+    max_results: int = 10,
+) -> List[PlaceInfo]:
+    """
+    Top-rated places of a type within radius_km of a point. Answered from the
+    local geo index; Text Search is only called when local coverage is thin.
+    """
+    def local() -> List[PlaceInfo]:
+        matches = _geo_index.query(lat, lng, radius_km, place_type, min_rating, max_results)
+        return [place for place, _ in matches]
+
+    places = local()
+    if len(places) >= min(max_results, settings.GEO_INDEX_MIN_RESULTS):
+        _geo_stats["local_hits"] += 1
+        return places
+
+    _geo_stats["upstream_fallbacks"] += 1
+    await search_places(
+        query=f"top rated {(place_type or 'places').replace('_', ' ')}",
+        location=f"{lat},{lng}",
+        radius=int(radius_km * 1000),
+        place_type=place_type,
+        min_rating=min_rating,
+        max_results=20,
+    )
+    # Text Search only biases toward the location, so filter through the index again
+    return local()
 
+
+async def _fetch_search_places(
+    query: str,
+    location: Optional[str],
+    radius: int,
+    place_type: Optional[str],
+    min_rating: float,
+    max_results: int,
+) -> Optional[List[PlaceInfo]]:
+    """
+    Call Text Search and convert the results to PlaceInfo models (None on API
+    error). Quota and availability failures raise PlacesUnavailableError so they
+    aren't mistaken for a destination with no places.
+    """
     params = {
         "query": query,
         "key": settings.GOOGLE_MAPS_API_KEY,
@@ -40,19 +173,21 @@ async def search_places(
     if place_type:
         params["type"] = place_type
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        response = await client.get(f"{BASE_URL}/textsearch/json", params=params)
-        data = response.json()
+    try:
+        data = await get_json("textsearch", f"{BASE_URL}/textsearch/json", params)
+    except httpx.HTTPError as e:
+        raise PlacesUnavailableError(f"Places search unavailable: {e}") from e
 
     if data.get("status") != "OK":
         print(f"Places API error: {data.get('status')} - {data.get('error_message', '')}")
-        return []
+        if data.get("status") in UNAVAILABLE_STATUSES:
+            raise PlacesUnavailableError(f"Places search unavailable ({data.get('status')})")
+        return None
 
     places = []
-    for result in data.get("results", [])[:max_results]:
+    all_places = []
+    for index, result in enumerate(data.get("results", [])):
         rating = result.get("rating", 0)
-        if rating < min_rating:
-            continue
 
         photo_url = ""
         if result.get("photos"):
@@ -75,20 +210,26 @@ async def search_places(
             latitude=result.get("geometry", {}).get("location", {}).get("lat"),
             longitude=result.get("geometry", {}).get("location", {}).get("lng"),
         )
-        places.append(place)
+        all_places.append(place)
+        if index < max_results and rating >= min_rating:
+            places.append(place)
+
+    # Every result feeds the geo index and geocode cache, including ones filtered out of this response
+    _geo_index.add(all_places)
+    seed_geocode_cache(all_places)
 
     # Sort by rating descending
     places.sort(key=lambda p: (p.rating or 0, p.total_ratings or 0), reverse=True)
-    _place_cache[cache_key] = places
     return places
 
 
 async def get_place_details(place_id: str) -> Optional[Dict[str, Any]]:
     """Get detailed information about a specific place."""
-    cache_key = f"detail:{place_id}"
-    if cache_key in _place_cache:
-        return _place_cache[cache_key]
+    return await _cached_lookup("details", place_id, _details_flight, lambda: _fetch_place_details(place_id))
+
 
+async def _fetch_place_details(place_id: str) -> Optional[Dict[str, Any]]:
+    """Call Place Details for a single place_id."""
     params = {
         "place_id": place_id,
         "fields": "name,formatted_address,rating,user_ratings_total,price_level,"
@@ -97,32 +238,72 @@ async def get_place_details(place_id: str) -> Optional[Dict[str, Any]]:
         "key": settings.GOOGLE_MAPS_API_KEY,
     }
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        response = await client.get(f"{BASE_URL}/details/json", params=params)
-        data = response.json()
+    data = await get_json("details", f"{BASE_URL}/details/json", params)
 
     if data.get("status") != "OK":
         return None
 
-    result = data.get("result", {})
-    _place_cache[cache_key] = result
-    return result
+    return data.get("result", {})
 
 
 async def autocomplete_places(input_text: str, types: str = "(cities)") -> List[Dict[str, str]]:
-    """Get autocomplete suggestions for place search."""
+    """
+    Get autocomplete suggestions for place search.
+    Answered in-process when possible: an exact cached response, a full page
+    from the prefix index, or a filtered earlier response for a shorter prefix
+    that was already exhaustive. Only unseen prefixes go upstream.
+    """
+    prefix = normalize_text(input_text)
+    cache_key = f"{types}|{prefix}"
+
+    cached = _place_cache.get("autocomplete", cache_key)
+    if cached is not None:
+        _autocomplete_stats["cache_hits"] += 1
+        return cached
+
+    local = _autocomplete_index.query(prefix, AUTOCOMPLETE_PAGE_SIZE) if types == "(cities)" else None
+    if local and len(local) >= AUTOCOMPLETE_PAGE_SIZE:
+        _autocomplete_stats["local_hits"] += 1
+        return local
+
+    # A shorter prefix that returned less than a full page listed every match
+    for end in range(len(prefix) - 1, 1, -1):
+        shorter = _place_cache.get("autocomplete", f"{types}|{prefix[:end]}")
+        if shorter is not None and len(shorter) < AUTOCOMPLETE_PAGE_SIZE:
+            _autocomplete_stats["prefix_reuse"] += 1
+            return [s for s in shorter if matches_prefix(s, prefix)]
+
+    with track_stale() as stale:
+        suggestions = await shared_call(
+            _autocomplete_flight, cache_key, lambda: _fetch_autocomplete(input_text, types)
+        )
+    if suggestions is None:
+        return local or []
+    if stale.stale:
+        return suggestions
+
+    _place_cache.set("autocomplete", cache_key, suggestions)
+    if types == "(cities)":
+        for suggestion in suggestions:
+            _autocomplete_index.add(suggestion, weight=0.1)
+    return suggestions
+
+
+async def _fetch_autocomplete(input_text: str, types: str) -> Optional[List[Dict[str, str]]]:
+    """Call Place Autocomplete; None on API errors so they aren't cached."""
     params = {
         "input": input_text,
         "types": types,
         "key": settings.GOOGLE_MAPS_API_KEY,
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(f"{BASE_URL}/autocomplete/json", params=params)
-        data = response.json()
+    data = await get_json("autocomplete", f"{BASE_URL}/autocomplete/json", params)
+    _autocomplete_stats["upstream"] += 1
 
-    if data.get("status") != "OK":
+    if data.get("status") == "ZERO_RESULTS":
         return []
+    if data.get("status") != "OK":
+        return None
 
     suggestions = []
     for prediction in data.get("predictions", []):
@@ -136,6 +317,35 @@ async def autocomplete_places(input_text: str, types: str = "(cities)") -> List[
     return suggestions
 
 
+def record_destination(destination: str, weight: float = 1.0):
+    """Add a trip destination to the autocomplete index (more trips rank it higher)."""
+    main_text, _, secondary_text = (destination or "").partition(",")
+    _autocomplete_index.add({
+        "description": destination.strip(),
+        "place_id": "",
+        "main_text": main_text.strip(),
+        "secondary_text": secondary_text.strip(),
+    }, weight=weight)
+
+
+async def seed_autocomplete_index():
+    """Load the most planned destinations from the trips collection into the prefix index."""
+    pipeline = [
+        {"$group": {"_id": "$request.destination", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}},
+        {"$limit": settings.AUTOCOMPLETE_SEED_LIMIT},
+    ]
+    try:
+        seeded = 0
+        async for doc in get_db().trips.aggregate(pipeline):
+            if doc["_id"]:
+                record_destination(doc["_id"], weight=doc["count"])
+                seeded += 1
+        print(f"🔤 Autocomplete index seeded with {seeded} destinations")
+    except Exception as e:
+        print(f"Autocomplete index seeding failed: {e}")
+
+
 async def get_top_restaurants(destination: str, max_results: int = 8) -> List[PlaceInfo]:
     """Get top-rated restaurants at a destination."""
     return await search_places(
@@ -173,7 +383,11 @@ async def get_hotels(destination: str, budget: str = "moderate", max_results: in
 
 
 async def get_destination_data(destination: str, budget: str = "moderate") -> Dict[str, Any]:
-    """Fetch all destination data in parallel for AI processing."""
+    """
+    Fetch all destination data in parallel for AI processing. Raises
+    PlacesUnavailableError rather than returning empty lists when Google is
+    over quota or down, so no itinerary is built (and cached) without data.
+    """
     restaurants, attractions, hotels = await asyncio.gather(
         get_top_restaurants(destination),
         get_top_attractions(destination),
@@ -185,3 +399,16 @@ async def get_destination_data(destination: str, budget: str = "moderate") -> Di
         "attractions": [a.model_dump() for a in attractions],
         "hotels": [h.model_dump() for h in hotels],
     }
+
+
+def place_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-namespace size, hit/miss and eviction counters for the in-process cache."""
+    return _place_cache.stats()
+
+
+def geo_index_stats() -> Dict[str, int]:
+    return {**_geo_index.stats(), **_geo_stats}
+
+
+def autocomplete_stats() -> Dict[str, int]:
+    return {**_autocomplete_index.stats(), **_autocomplete_stats}
@@ -0,0 +1,161 @@
+"""
+Request Profiler
+Opt-in sampling profiler (pyinstrument) around live requests. An admin turns
+it on for a fraction of traffic with /debug/profile, or marks one request with
+an `X-Profile: <PROFILER_ADMIN_TOKEN>` header. Each profile is written as
+speedscope JSON into PROFILE_DIR, which keeps only the newest PROFILE_MAX_FILES.
+With the sample rate at 0 an unmarked request costs one header scan.
+"""
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from pyinstrument import Profiler
+from pyinstrument.renderers import SpeedscopeRenderer
+
+from app.config import settings
+from app.services.auth_service import is_admin_token
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".speedscope.json"
+_SKIP_PREFIXES = ("/debug/profile", "/metrics", "/health")
+_UNSAFE = re.compile(r"[^A-Za-z0-9_-]+")
+
+_sample_rate: float = 0.0
+_path_prefix: Optional[str] = None
+_profiled = 0
+_write_errors = 0
+_pending_writes: Set[asyncio.Task] = set()
+_ring_lock = threading.Lock()  # one writer prunes the directory at a time
+
+
+def configure_sampling(sample_rate: float, path_prefix: Optional[str] = None):
+    """Profile this fraction of requests (optionally only paths under path_prefix); 0 turns it off."""
+    global _sample_rate, _path_prefix
+    _sample_rate = sample_rate
+    _path_prefix = path_prefix or None
+    state = f"{sample_rate:.0%} of {path_prefix or 'all'} requests" if sample_rate else "off"
+    print(f"🔬 Request profiling: {state}")
+
+
+def _marked(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return is_admin_token(value.decode("latin-1"))
+    return False
+
+
+def _sampled(path: str) -> bool:
+    if _path_prefix and not path.startswith(_path_prefix):
+        return False
+    return random.random() < _sample_rate
+
+
+def _should_profile(scope) -> bool:
+    if scope["path"].startswith(_SKIP_PREFIXES):
+        return False
+    return _marked(scope) or (_sample_rate > 0 and _sampled(scope["path"]))
+
+
+def _profile_name(method: str, path: str) -> str:
+    slug = _UNSAFE.sub("_", path.strip("/"))[:80] or "root"
+    return f"{time.time_ns()}-{method.lower()}-{slug}{PROFILE_SUFFIX}"
+
+
+def _write_profile(session, name: str):
+    """Render speedscope JSON, write it atomically and drop the oldest files past the cap."""
+    rendered = SpeedscopeRenderer().render(session)
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(settings.PROFILE_DIR, name)
+    with _ring_lock:
+        with open(path + ".tmp", "w") as f:
+            f.write(rendered)
+        os.replace(path + ".tmp", path)
+        for old in list_profiles()[settings.PROFILE_MAX_FILES:]:
+            try:
+                os.remove(os.path.join(settings.PROFILE_DIR, old["name"]))
+            except FileNotFoundError:
+                pass
+
+
+async def _save(session, name: str):
+    global _profiled, _write_errors
+    try:
+        await asyncio.to_thread(_write_profile, session, name)
+        _profiled += 1
+    except Exception as e:
+        _write_errors += 1
+        print(f"⚠️ Could not write profile {name}: {e}")
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Stored profiles, newest first."""
+    try:
+        entries = [e for e in os.scandir(settings.PROFILE_DIR) if e.name.endswith(PROFILE_SUFFIX)]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name, reverse=True)
+    profiles = []
+    for entry in entries:
+        try:
+            profiles.append({"name": entry.name, "bytes": entry.stat().st_size})
+        except FileNotFoundError:  # pruned by a concurrent write
+            continue
+    return profiles
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Path of a stored profile, only for names that are actually in the ring."""
+    if any(p["name"] == name for p in list_profiles()):
+        return os.path.join(settings.PROFILE_DIR, name)
+    return None
+
+
+class ProfilerMiddleware:
+    """ASGI middleware that profiles sampled or marked HTTP requests, including streamed bodies."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        name = _profile_name(scope["method"], scope["path"])
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", name.encode())]
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILE_INTERVAL, async_mode="enabled")
+        try:
+            profiler.start()
+        except RuntimeError:  # already profiling this task (nested app)
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            session = profiler.stop()
+            task = asyncio.create_task(_save(session, name))
+            _pending_writes.add(task)
+            task.add_done_callback(_pending_writes.discard)
+
+
+def profiler_stats() -> Dict[str, Any]:
+    return {
+        "enabled": bool(settings.PROFILER_ADMIN_TOKEN),
+        "sample_rate": _sample_rate,
+        "path_prefix": _path_prefix,
+        "profiled": _profiled,
+        "write_errors": _write_errors,
+        "stored": len(list_profiles()) if settings.PROFILER_ADMIN_TOKEN else 0,
+        "max_files": settings.PROFILE_MAX_FILES,
+    }
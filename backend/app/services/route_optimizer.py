@@ -0,0 +1,276 @@
+"""
+Route Optimizer
+Reorders each day's activities into a short walking/driving order using only
+the place coordinates already in the itinerary: a vectorized haversine
+distance matrix, nearest-neighbour construction and 2-opt on an open path.
+Meals and activities that can't be re-timed stay put as anchors; the movable
+activities between two anchors are reordered and re-timed from the first
+start using their durations plus a travel allowance per leg.
+"""
+
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Travel allowance between stops: door-to-door city speed plus a fixed buffer, rounded up
+TRAVEL_SPEED_KMH = 20.0
+TRAVEL_BUFFER_MINUTES = 5
+ROUND_TO_MINUTES = 5
+
+_CLOCK = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*([AaPp][Mm])?\s*$")
+_HOURS = re.compile(r"(\d+(?:\.\d+)?)(?:\s*(?:-|–|to)\s*(\d+(?:\.\d+)?))?\s*(?:h|hrs?|hours?)\b", re.I)
+_MINUTES = re.compile(r"(\d+)(?:\s*(?:-|–|to)\s*(\d+))?\s*(?:m|mins?|minutes?)\b", re.I)
+
+
+def haversine_matrix(coords: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances (km) for an (n, 2) array of lat/lng degrees."""
+    radians = np.radians(coords)
+    lat = radians[:, 0][:, None]
+    lng = radians[:, 1][:, None]
+    d_lat = lat - lat.T
+    d_lng = lng - lng.T
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin(d_lng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(dist: np.ndarray, path: List[int]) -> float:
+    return float(sum(dist[a, b] for a, b in zip(path, path[1:])))
+
+
+def _nearest_neighbor(dist: np.ndarray, start: int, skip: Optional[int] = None) -> List[int]:
+    path = [start]
+    visited = np.zeros(len(dist), dtype=bool)
+    visited[start] = True
+    if skip is not None:
+        visited[skip] = True
+    while not visited.all():
+        row = np.where(visited, np.inf, dist[path[-1]])
+        nxt = int(np.argmin(row))
+        path.append(nxt)
+        visited[nxt] = True
+    return path
+
+
+def _two_opt(dist: np.ndarray, path: List[int], lo: int = 0, hi: Optional[int] = None) -> List[int]:
+    """Reverse segments within path[lo:hi + 1] while that shortens the open path (no return to start)."""
+    n = len(path)
+    hi = n - 1 if hi is None else hi
+    improved = True
+    while improved:
+        improved = False
+        for i in range(lo, hi):
+            for j in range(i + 1, hi + 1):
+                before = dist[path[i - 1], path[i]] if i > 0 else 0.0
+                after = dist[path[j], path[j + 1]] if j < n - 1 else 0.0
+                new_before = dist[path[i - 1], path[j]] if i > 0 else 0.0
+                new_after = dist[path[i], path[j + 1]] if j < n - 1 else 0.0
+                if new_before + new_after < before + after - 1e-9:
+                    path[i:j + 1] = reversed(path[i:j + 1])
+                    improved = True
+    return path
+
+
+def solve_open_tsp(dist: np.ndarray, first: Optional[int] = None, last: Optional[int] = None) -> List[int]:
+    """
+    Short open path visiting every node once: best nearest-neighbour start, then
+    2-opt. `first` / `last` pin a node to either end (the anchors around a segment).
+    """
+    n = len(dist)
+    if n <= 2 and first is None and last is None:
+        return list(range(n))
+    starts = [first] if first is not None else [i for i in range(n) if i != last]
+    lo = 1 if first is not None else 0
+    hi = n - 2 if last is not None else n - 1
+    candidates = []
+    for start in starts:
+        path = _nearest_neighbor(dist, start, skip=last)
+        if last is not None:
+            path.append(last)
+        candidates.append(_two_opt(dist, path, lo, hi))
+    return min(candidates, key=lambda path: path_length(dist, path))
+
+
+def _coords(activity: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    place = activity.get("place") or {}
+    lat, lng = place.get("latitude"), place.get("longitude")
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return float(lat), float(lng)
+    return None
+
+
+def parse_clock(value: Any) -> Optional[int]:
+    """Minutes since midnight for "09:00 AM" / "14:30"; None if unparseable."""
+    match = _CLOCK.match(value) if isinstance(value, str) else None
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2)), match.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower() == "pm" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def format_clock(minutes: int, twelve_hour: bool = True) -> str:
+    hour, minute = divmod(minutes % (24 * 60), 60)
+    if not twelve_hour:
+        return f"{hour:02d}:{minute:02d}"
+    return f"{(hour % 12) or 12:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def parse_duration(value: Any) -> Optional[int]:
+    """Minutes for "2 hours", "1.5-2 hrs", "1 hour 30 minutes", "45 min"; ranges take the upper bound."""
+    if not isinstance(value, str):
+        return None
+    total = 0.0
+    found = False
+    for pattern, scale in ((_HOURS, 60), (_MINUTES, 1)):
+        for match in pattern.finditer(value):
+            total += float(match.group(2) or match.group(1)) * scale
+            found = True
+    return int(math.ceil(total)) if found and total > 0 else None
+
+
+def travel_minutes(km: float) -> int:
+    """Allowance for one leg of `km` great-circle distance."""
+    return int(math.ceil(km / TRAVEL_SPEED_KMH * 60)) + TRAVEL_BUFFER_MINUTES
+
+
+def _round_up(minutes: int) -> int:
+    return -(-minutes // ROUND_TO_MINUTES) * ROUND_TO_MINUTES
+
+
+# A fixed stop around a segment: its coordinates (if known) and start time
+Anchor = Tuple[Optional[Tuple[float, float]], int]
+
+
+def _retime(starts: List[int], durations: List[int], dist: np.ndarray, order: List[int]) -> Tuple[List[int], int]:
+    """Start times for `stops` visited in `order`, from the segment's first start; also the end time."""
+    t = starts[0]
+    times = []
+    for k, node in enumerate(order):
+        if k > 0:
+            t = _round_up(t + travel_minutes(dist[order[k - 1], node]))
+        times.append(t)
+        t += durations[node]
+    return times, t
+
+
+def _optimize_segment(
+    segment: List[Tuple[Dict[str, Any], Tuple[float, float], int]],
+    before_anchor: Optional[Anchor],
+    after_anchor: Optional[Anchor],
+    min_saving: float,
+) -> Tuple[float, float, Optional[List[Tuple[Dict[str, Any], int]]]]:
+    """
+    Reorder the movable activities between two anchors. Returns (km_before,
+    km_after, [(activity, start minutes)]) or None for the schedule when the
+    saving is too small or the re-timed run would overrun the next anchor.
+    """
+    m = len(segment)
+    coords = [c for _, c, _ in segment]
+    first = last = None
+    if before_anchor is not None and before_anchor[0] is not None:
+        first = len(coords)
+        coords.append(before_anchor[0])
+    if after_anchor is not None and after_anchor[0] is not None:
+        last = len(coords)
+        coords.append(after_anchor[0])
+    if m < 2 or len(coords) < 3:
+        return 0.0, 0.0, None
+
+    dist = haversine_matrix(np.array(coords))
+    original = ([first] if first is not None else []) + list(range(m)) + ([last] if last is not None else [])
+    before = path_length(dist, original)
+    path = solve_open_tsp(dist, first, last)
+    after = path_length(dist, path)
+    if before - after <= before * min_saving:
+        return before, before, None
+
+    order = [node for node in path if node < m]
+    starts = [start for _, _, start in segment]
+    durations = [parse_duration(activity.get("duration")) for activity, _, _ in segment]
+    times, end = _retime(starts, durations, dist, order)
+    if after_anchor is not None:
+        # Reach the next fixed stop in time, unless the original plan already ran past it
+        if last is not None:
+            end += travel_minutes(dist[order[-1], last])
+        if end > max(after_anchor[1], starts[-1] + durations[-1]):
+            return before, before, None
+    return before, after, [(segment[node][0], t) for node, t in zip(order, times)]
+
+
+def optimize_day(day: Dict[str, Any], min_saving: float = 0.05) -> Tuple[float, float]:
+    """
+    Reorder day["activities"] in place and re-time them. Activities with
+    coordinates and a known duration are movable; meals and every other
+    activity keep their time and place and split the day into segments that
+    are optimized between those anchors. Each reordered segment is re-timed
+    forward from its first start: duration, then a travel allowance for the
+    next leg. Days whose activity times can't be parsed are left alone.
+    Returns (km_before, km_after).
+    """
+    activities = day.get("activities") or []
+    starts = [parse_clock(a.get("time")) for a in activities]
+    if len(activities) < 2 or any(start is None for start in starts):
+        return 0.0, 0.0
+    twelve_hour = any("m" in a["time"].lower() for a in activities)
+
+    # (start, is_meal, index, item) in chronological order; ties keep activities first
+    timeline = [(start, 0, i, a) for i, (start, a) in enumerate(zip(starts, activities))]
+    for i, meal in enumerate(day.get("meals") or []):
+        start = parse_clock(meal.get("time")) if isinstance(meal, dict) else None
+        if start is not None:
+            timeline.append((start, 1, i, meal))
+    timeline.sort(key=lambda entry: entry[:3])
+
+    total_before = total_after = 0.0
+    schedule: List[Tuple[Dict[str, Any], int]] = []  # (activity, start) in visiting order
+    segment: List[Tuple[Dict[str, Any], Tuple[float, float], int]] = []  # movable (activity, coords, start)
+    before_anchor: Optional[Anchor] = None
+
+    def flush(after_anchor):
+        nonlocal total_before, total_after
+        before, after, retimed = _optimize_segment(segment, before_anchor, after_anchor, min_saving)
+        total_before += before
+        total_after += after
+        if retimed is None:
+            retimed = [(activity, start) for activity, _, start in segment]
+        schedule.extend(retimed)
+        segment.clear()
+
+    for start, is_meal, _, item in timeline:
+        coords = _coords(item)
+        if not is_meal and coords is not None and parse_duration(item.get("duration")) is not None:
+            segment.append((item, coords, start))
+            continue
+        anchor = (coords, start)
+        flush(anchor)
+        if not is_meal:
+            schedule.append((item, start))
+        before_anchor = anchor
+    flush(None)
+
+    if total_after < total_before:
+        for activity, start in schedule:
+            if parse_clock(activity.get("time")) != start:
+                activity["time"] = format_clock(start, twelve_hour)
+        day["activities"] = [activity for activity, _ in schedule]
+    return total_before, total_after
+
+
+def optimize_itinerary_routes(itinerary: Dict[str, Any]) -> Tuple[float, float]:
+    """Optimize every day of a raw itinerary dict; returns total (km_before, km_after)."""
+    total_before = total_after = 0.0
+    for day in itinerary.get("days") or []:
+        if isinstance(day, dict):
+            before, after = optimize_day(day)
+            total_before += before
+            total_after += after
+    return total_before, total_after
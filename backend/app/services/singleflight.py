@@ -0,0 +1,54 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key await one shared upstream call
+instead of each sending an identical request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+# All groups, by name, for singleflight_stats()
+_groups: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one in-flight task."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        _groups[name] = self
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the call already running for it."""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced_calls += 1
+        else:
+            self.upstream_calls += 1
+            # The shared work runs in its own task so one caller's
+            # cancellation (e.g. a client disconnect) doesn't fail the others.
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """Coalesced vs. real upstream call counters for every group."""
+    return {name: group.stats() for name, group in _groups.items()}
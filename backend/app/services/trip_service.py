@@ -0,0 +1,142 @@
+"""
+Trip Persistence Service
+Stores generated itineraries in the trips collection and lists them back
+newest-first with keyset (created_at, _id) pagination.
+"""
+
+import base64
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from app.database import get_db
+from app.models import TripRequest, TripItinerary, TripResponse, TripSummary
+from app.services.metrics import time_stage
+from app.services.places_service import record_destination
+
+
+async def save_trip(
+    trip_request: TripRequest,
+    itinerary: TripItinerary,
+    user_id: Optional[str] = None,
+) -> TripResponse:
+    """Persist a generated itinerary and build the API response."""
+    db = get_db()
+    trip_doc = {
+        "user_id": user_id,
+        "request": trip_request.model_dump(),
+        "itinerary": itinerary.model_dump(),
+        "created_at": datetime.now(timezone.utc),
+    }
+
+    with time_stage("db_insert"):
+        result = await db.trips.insert_one(trip_doc)
+    record_destination(trip_request.destination)
+
+    return TripResponse(
+        id=str(result.inserted_id),
+        user_id=trip_doc["user_id"],
+        request=trip_request,
+        itinerary=itinerary,
+        created_at=trip_doc["created_at"],
+    )
+
+
+async def get_trip_day(trip_id: str, day_number: int) -> Optional[Dict[str, Any]]:
+    """Load one day of a stored itinerary, or None if the trip/day doesn't exist."""
+    try:
+        oid = ObjectId(trip_id)
+    except Exception:
+        return None
+
+    doc = await get_db().trips.find_one({"_id": oid}, {"itinerary.days": 1})
+    if not doc:
+        return None
+    for day in doc.get("itinerary", {}).get("days", []):
+        if day.get("day") == day_number:
+            return day
+    return None
+
+
+# Header fields needed for a trip summary card (no days, no places)
+SUMMARY_PROJECTION = {
+    "user_id": 1,
+    "created_at": 1,
+    "request.destination": 1,
+    "request.start_date": 1,
+    "request.end_date": 1,
+    "request.travelers": 1,
+    "itinerary.destination": 1,
+    "itinerary.summary": 1,
+    "itinerary.total_days": 1,
+}
+
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    raw = f"{doc['created_at'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Inverse of encode_cursor; raises ValueError on anything malformed."""
+    try:
+        created_at, _, trip_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").partition("|")
+        return datetime.fromisoformat(created_at), ObjectId(trip_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def list_trips(
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of a user's trips, newest first, plus the cursor for the next page."""
+    query: Dict[str, Any] = {"user_id": user_id}
+    if cursor:
+        created_at, trip_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": trip_id}},
+        ]
+
+    docs = await (
+        get_db().trips.find(query, projection)
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+
+def trip_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    TripResponse-shaped dict straight from a stored trip. Stored trips were
+    written from validated models (save_trip), so reads skip re-validation.
+    """
+    return {
+        "id": str(doc["_id"]),
+        "user_id": doc.get("user_id"),
+        "request": doc["request"],
+        "itinerary": doc["itinerary"],
+        "created_at": doc["created_at"],
+    }
+
+
+def trip_summary(doc: Dict[str, Any]) -> TripSummary:
+    request = doc.get("request", {})
+    itinerary = doc.get("itinerary", {})
+    return TripSummary(
+        id=str(doc["_id"]),
+        user_id=doc.get("user_id"),
+        destination=itinerary.get("destination") or request.get("destination", ""),
+        summary=itinerary.get("summary", ""),
+        total_days=itinerary.get("total_days", 0),
+        start_date=request.get("start_date", ""),
+        end_date=request.get("end_date", ""),
+        travelers=request.get("travelers", 1),
+        created_at=doc["created_at"],
+    )
@@ -0,0 +1,178 @@
+"""
+Fake Google Maps Platform
+Deterministic stand-in for Places Text Search / Details / Autocomplete,
+Directions, Distance Matrix and Geocoding, served through an httpx transport
+so the app's shared client talks to it exactly as it would to Google.
+Every response waits `latency_ms` (plus jitter) to model the network.
+"""
+
+import asyncio
+import hashlib
+import random
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from app.services.maps_service import encode_polyline
+
+CITY_CENTER = (48.8566, 2.3522)
+_WORDS = ["Grand", "Old", "Royal", "Little", "Blue", "Golden", "Hidden", "River", "Garden", "Market"]
+_KINDS = {
+    "restaurant": ["Bistro", "Brasserie", "Kitchen", "Table"],
+    "tourist_attraction": ["Museum", "Cathedral", "Tower", "Gallery"],
+    "lodging": ["Hotel", "Inn", "Suites", "Residence"],
+}
+_CITIES = ["Paris", "Parma", "Porto", "Prague", "Perth", "Pune", "Tokyo", "Toronto", "Tunis", "Turin"]
+
+
+def _seed(*parts: Any) -> int:
+    return int(hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()[:8], 16)
+
+
+def _coords(label: str) -> Tuple[float, float]:
+    """Stable point within ~10 km of the city center for any label."""
+    rng = random.Random(_seed(label))
+    return CITY_CENTER[0] + rng.uniform(-0.08, 0.08), CITY_CENTER[1] + rng.uniform(-0.12, 0.12)
+
+
+def _parse_point(text: str) -> Tuple[float, float]:
+    try:
+        lat, lng = (float(v) for v in text.split(","))
+        return lat, lng
+    except ValueError:
+        return _coords(text)
+
+
+class FakeGoogle:
+    """Routes Maps Platform URLs to generated responses; counts calls per endpoint."""
+
+    def __init__(self, latency_ms: float = 80.0, jitter_ms: float = 20.0, results_per_search: int = 20):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.results_per_search = results_per_search
+        self.calls: Dict[str, int] = {}
+        self._routes: Dict[str, Callable[[httpx.QueryParams], Dict[str, Any]]] = {
+            "/maps/api/place/textsearch/json": self.text_search,
+            "/maps/api/place/details/json": self.details,
+            "/maps/api/place/autocomplete/json": self.autocomplete,
+            "/maps/api/directions/json": self.directions,
+            "/maps/api/distancematrix/json": self.distance_matrix,
+            "/maps/api/geocode/json": self.geocode,
+        }
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        route = self._routes.get(request.url.path)
+        if route is None:
+            return httpx.Response(404, json={"status": "NOT_FOUND"})
+        name = request.url.path.split("/")[-2]
+        self.calls[name] = self.calls.get(name, 0) + 1
+        await asyncio.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0))
+        return httpx.Response(200, json=route(request.url.params))
+
+    # ── Places ──
+
+    def _place(self, query: str, index: int, kind: str) -> Dict[str, Any]:
+        rng = random.Random(_seed(query, index))
+        name = f"{rng.choice(_WORDS)} {rng.choice(_KINDS.get(kind, _KINDS['tourist_attraction']))} {index}"
+        lat, lng = _coords(f"{query}#{index}")
+        return {
+            "name": name,
+            "formatted_address": f"{index} Rue {rng.choice(_WORDS)}, 750{index % 20:02d} Paris, France",
+            "rating": round(rng.uniform(3.6, 4.9), 1),
+            "user_ratings_total": rng.randint(50, 20000),
+            "price_level": rng.randint(1, 4),
+            "types": [kind, "point_of_interest", "establishment"],
+            "photos": [{"photo_reference": f"photo-{_seed(query, index)}"}],
+            "place_id": f"fake-{_seed(query, index)}",
+            "geometry": {"location": {"lat": lat, "lng": lng}},
+        }
+
+    def text_search(self, params: httpx.QueryParams) -> Dict[str, Any]:
+        kind = params.get("type") or "tourist_attraction"
+        query = params.get("query", "")
+        return {"status": "OK", "results": [self._place(query, i, kind) for i in range(self.results_per_search)]}
+
+    def details(self, params: httpx.QueryParams) -> Dict[str, Any]:
+        place_id = params.get("place_id", "")
+        place = self._place(place_id, 0, "tourist_attraction")
+        place.update({
+            "opening_hours": {"weekday_text": ["Monday: 9:00 AM – 6:00 PM"] * 7},
+            "website": "https://example.com",
+            "formatted_phone_number": "+33 1 23 45 67 89",
+            "reviews": [{"author_name": "A", "rating": 5, "text": "Great place. " * 20}] * 5,
+            "url": f"https://maps.google.com/?cid={_seed(place_id)}",
+        })
+        return {"status": "OK", "result": place}
+
+    def autocomplete(self, params: httpx.QueryParams) -> Dict[str, Any]:
+        prefix = params.get("input", "").casefold()
+        matches = [c for c in _CITIES if c.casefold().startswith(prefix)][:5]
+        return {
+            "status": "OK" if matches else "ZERO_RESULTS",
+            "predictions": [
+                {
+                    "description": f"{city}, Country",
+                    "place_id": f"city-{_seed(city)}",
+                    "structured_formatting": {"main_text": city, "secondary_text": "Country"},
+                }
+                for city in matches
+            ],
+        }
+
+    # ── Routes ──
+
+    @staticmethod
+    def _leg(origin: str, destination: str) -> Dict[str, Any]:
+        a, b = _parse_point(origin), _parse_point(destination)
+        km = max(((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5 * 111, 0.1)
+        seconds = int(km / 30 * 3600)
+        return {
+            "distance": {"text": f"{km:.1f} km", "value": int(km * 1000)},
+            "duration": {"text": f"{seconds // 60} mins", "value": seconds},
+            "start_address": origin,
+            "end_address": destination,
+            "steps": [
+                {
+                    "html_instructions": f"Head towards {destination}",
+                    "distance": {"text": f"{km:.1f} km", "value": int(km * 1000)},
+                    "duration": {"text": f"{seconds // 60} mins", "value": seconds},
+                    "polyline": {"points": encode_polyline([a, b])},
+                }
+            ],
+        }
+
+    def directions(self, params: httpx.QueryParams) -> Dict[str, Any]:
+        waypoints = params.get("waypoints")
+        stops: List[str] = [params.get("origin", "")]
+        stops += waypoints.split("|") if waypoints else []
+        stops.append(params.get("destination", ""))
+        legs = [self._leg(a, b) for a, b in zip(stops, stops[1:])]
+        return {"status": "OK", "routes": [{"legs": legs}]}
+
+    def distance_matrix(self, params: httpx.QueryParams) -> Dict[str, Any]:
+        origins = params.get("origins", "").split("|")
+        destinations = params.get("destinations", "").split("|")
+        rows = []
+        for origin in origins:
+            elements = []
+            for destination in destinations:
+                leg = self._leg(origin, destination)
+                elements.append({"status": "OK", "distance": leg["distance"], "duration": leg["duration"]})
+            rows.append({"elements": elements})
+        return {
+            "status": "OK",
+            "origin_addresses": origins,
+            "destination_addresses": destinations,
+            "rows": rows,
+        }
+
+    def geocode(self, params: httpx.QueryParams) -> Dict[str, Any]:
+        address = params.get("address", "")
+        lat, lng = _coords(address)
+        return {
+            "status": "OK",
+            "results": [{"geometry": {"location": {"lat": lat, "lng": lng}}, "formatted_address": address}],
+        }
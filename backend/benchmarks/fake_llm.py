@@ -0,0 +1,142 @@
+"""
+Fake Chat Model
+LangChain chat model that answers the trip planner prompts (full itinerary,
+skeleton and day windows) with valid JSON, after a configurable time to first
+token and at a configurable output token rate, so generation cost looks like
+a real Gemini call without leaving the machine.
+"""
+
+import asyncio
+import json
+import random
+import re
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from benchmarks.fake_google import CITY_CENTER
+
+CHARS_PER_TOKEN = 4
+_DATES = re.compile(r"\*\*Dates:\*\* (\d{4}-\d{2}-\d{2}) to \S+ \((\d+) days\)")
+_DESTINATION = re.compile(r"\*\*Destination:\*\* (.+)")
+_WINDOW = re.compile(r"Plan ONLY days (\d+) to (\d+)")
+
+
+def _place(rng: random.Random, label: str) -> Dict[str, Any]:
+    return {
+        "name": label,
+        "address": f"{rng.randint(1, 99)} Rue Example, Paris",
+        "rating": round(rng.uniform(4.0, 4.9), 1),
+        "latitude": CITY_CENTER[0] + rng.uniform(-0.05, 0.05),
+        "longitude": CITY_CENTER[1] + rng.uniform(-0.08, 0.08),
+    }
+
+
+def _day(rng: random.Random, number: int, date: str) -> Dict[str, Any]:
+    times = ["09:00 AM", "11:00 AM", "02:00 PM", "04:30 PM"]
+    return {
+        "day": number,
+        "date": date,
+        "theme": f"Neighbourhood walk {number}",
+        "activities": [
+            {
+                "time": t,
+                "title": f"Visit sight {number}.{i}",
+                "description": "A short description of why this stop is worth the time. " * 2,
+                "duration": "1.5 hours",
+                "place": _place(rng, f"Sight {number}.{i}"),
+                "tips": "Go early to avoid the queue.",
+                "estimated_cost": "$15",
+            }
+            for i, t in enumerate(times)
+        ],
+        "meals": [
+            {
+                "time": t,
+                "title": f"{meal} at Bistro {number}",
+                "description": "Local favourite.",
+                "place": _place(rng, f"Bistro {number}.{meal}"),
+                "estimated_cost": "$30",
+            }
+            for meal, t in (("Lunch", "12:30 PM"), ("Dinner", "07:30 PM"))
+        ],
+        "accommodation_tip": "Stay near the center.",
+    }
+
+
+def _header(destination: str, total_days: int) -> Dict[str, Any]:
+    return {
+        "destination": destination,
+        "summary": f"A {total_days}-day trip through {destination}.",
+        "total_days": total_days,
+        "best_time_to_visit": "Spring",
+        "currency": "EUR",
+        "language": "French",
+        "travel_tips": [f"Tip {i}" for i in range(6)],
+        "packing_list": [f"Item {i}" for i in range(10)],
+        "estimated_total_budget": "$2500",
+        "emergency_contacts": {"police": "17", "ambulance": "15", "tourist_helpline": "3975"},
+    }
+
+
+def fake_itinerary_response(prompt: str) -> str:
+    """JSON answer for whichever trip planner prompt this is."""
+    destination = (_DESTINATION.search(prompt) or [None, "Paris"])[1].strip()
+    dates = _DATES.search(prompt)
+    start = datetime.strptime(dates[1], "%Y-%m-%d") if dates else datetime(2026, 5, 1)
+    total_days = int(dates[2]) if dates else 3
+    rng = random.Random(zlib.crc32(prompt.encode()))
+
+    def date(n: int) -> str:
+        return (start + timedelta(days=n - 1)).strftime("%Y-%m-%d")
+
+    window = _WINDOW.search(prompt)
+    if window:
+        first, last = int(window[1]), int(window[2])
+        return json.dumps({"days": [_day(rng, n, date(n)) for n in range(first, last + 1)]})
+    header = _header(destination, total_days)
+    if '"day_themes"' in prompt:
+        header["day_themes"] = [{"day": n, "theme": f"Area {n}"} for n in range(1, total_days + 1)]
+        return json.dumps(header)
+    header["days"] = [_day(rng, n, date(n)) for n in range(1, total_days + 1)]
+    return json.dumps(header)
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model with Gemini-like timing: first-token latency, then tokens_per_second output."""
+
+    first_token_ms: float = 600.0
+    tokens_per_second: float = 250.0
+    stream_chunk_tokens: int = 20
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-trip-planner"
+
+    def _answer(self, messages: List[BaseMessage]) -> str:
+        self.calls += 1
+        return fake_itinerary_response("\n".join(str(m.content) for m in messages))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer(messages)))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text = self._answer(messages)
+        await asyncio.sleep(self.first_token_ms / 1000 + len(text) / CHARS_PER_TOKEN / self.tokens_per_second)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        text = self._answer(messages)
+        await asyncio.sleep(self.first_token_ms / 1000)
+        size = self.stream_chunk_tokens * CHARS_PER_TOKEN
+        for i in range(0, len(text), size):
+            await asyncio.sleep(self.stream_chunk_tokens / self.tokens_per_second)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text[i:i + size]))
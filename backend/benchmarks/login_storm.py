@@ -0,0 +1,71 @@
+"""
+Login Storm Benchmark
+Fires N concurrent password verifications and measures event-loop lag with a
+5 ms ticker, first with bcrypt inline on the loop (the old behaviour), then
+through the auth service's hashing pool.
+
+Run from backend/:  python -m benchmarks.login_storm --logins 50 --rounds 12
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.services import auth_service
+
+TICK = 0.005
+
+
+async def _ticker(lags: list, stop: asyncio.Event):
+    """Record how late each 5 ms tick fires; a blocked loop shows up as large lags."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def _inline_verify(password: str, hashed: str):
+    auth_service.pwd_context.verify(password, hashed)
+
+
+async def _pooled_verify(password: str, hashed: str):
+    await auth_service.verify_password(password, hashed)
+
+
+async def _storm(verify, logins: int, hashed: str) -> dict:
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    await asyncio.sleep(TICK * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[verify("correct horse battery staple", hashed) for _ in range(logins)])
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    lags.sort()
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "logins_per_s": round(logins / elapsed, 1),
+        "loop_lag_p50_ms": round(lags[len(lags) // 2] * 1000, 2),
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2),
+        "ticks": len(lags),
+    }
+
+
+async def main(logins: int, rounds: int):
+    auth_service.pwd_context.update(bcrypt__rounds=rounds, bcrypt__min_rounds=rounds)
+    hashed = await auth_service.hash_password("correct horse battery staple")
+    print(f"bcrypt rounds={rounds}, logins={logins}, workers={auth_service.settings.PASSWORD_HASH_WORKERS}")
+    for name, verify in (("inline", _inline_verify), ("pool", _pooled_verify)):
+        print(f"{name:>6}: {await _storm(verify, logins, hashed)}")
+    auth_service.close_password_hasher()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=auth_service.settings.BCRYPT_ROUNDS)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.rounds))
@@ -0,0 +1,215 @@
+"""
+Offline API Benchmark
+Drives the FastAPI app in-process (httpx ASGITransport) with Google and
+Gemini replaced by local stand-ins (benchmarks.fake_google, benchmarks.fake_llm)
+and MongoDB by mongomock, or a real local mongod with --mongo-url. For each
+scenario and concurrency level it reports p50/p95/p99 latency, requests per
+second, errors and event-loop lag.
+
+Run from backend/:
+    python -m benchmarks.run
+    python -m benchmarks.run --scenarios places_search,trips_generate --concurrency 1,16,64
+    python -m benchmarks.run --json results.json   # keep for regression comparisons
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.config import settings
+
+# No persistent places tier; trip scenarios pass no_cache=true to skip the result cache
+settings.PLACE_CACHE_BACKEND = "none"
+settings.GEMINI_WARMUP = False
+
+from app import database  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services import ai_service, auth_service, http_client  # noqa: E402
+from app.services.persistent_cache import init_persistent_cache  # noqa: E402
+from benchmarks.fake_google import FakeGoogle  # noqa: E402
+from benchmarks.fake_llm import FakeChatModel  # noqa: E402
+
+Scenario = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+TICK = 0.005
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password-123"
+
+
+def _trip(days: int, i: int) -> Dict[str, Any]:
+    return {
+        "destination": f"Paris, France #{i}",
+        "start_date": "2026-05-01",
+        "end_date": f"2026-05-{days:02d}",
+        "travelers": 2,
+        "budget": "moderate",
+        "travel_style": ["cultural"],
+        "interests": ["art", "food"],
+    }
+
+
+def build_scenarios(token: str) -> Dict[str, Scenario]:
+    auth = {"Authorization": f"Bearer {token}"}
+    stops = [f"{48.85 + k * 0.004:.4f},{2.33 + k * 0.006:.4f}" for k in range(6)]
+    prefixes = ["pa", "par", "pr", "to", "tor", "tu", "po", "pe"]
+    cold = itertools.count()  # unique across levels, so every cold search misses the caches
+
+    return {
+        "health": lambda c, i: c.get("/health"),
+        "auth_login": lambda c, i: c.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD}),
+        "trips_summary": lambda c, i: c.get("/api/trips/summary", headers=auth),
+        "places_search": lambda c, i: c.get("/api/places/search", params={"query": f"museums in district {i % 40}"}),
+        "places_search_cold": lambda c, i: c.get("/api/places/search", params={"query": f"cold query {next(cold)}"}),
+        "places_details": lambda c, i: c.get(f"/api/places/details/fake-{i % 100}"),
+        "places_autocomplete": lambda c, i: c.get("/api/places/autocomplete", params={"input": prefixes[i % len(prefixes)]}),
+        "directions_day": lambda c, i: c.post("/api/places/directions/day", json={"stops": stops[i % 3:]}),
+        "distance_matrix": lambda c, i: c.post("/api/places/distance-matrix", json={
+            "origins": stops, "destinations": stops[::-1], "mode": "driving",
+        }),
+        "geocode_batch": lambda c, i: c.post("/api/places/geocode/batch", json={
+            "addresses": [f"{n} Rue Example, Paris" for n in range(i % 5, i % 5 + 20)],
+        }, headers=auth),
+        "trips_generate": lambda c, i: c.post("/api/trips/generate", params={"no_cache": "true"},
+                                              json=_trip(3, i), headers=auth),
+        "trips_generate_long": lambda c, i: c.post("/api/trips/generate", params={"no_cache": "true"},
+                                                   json=_trip(10, i), headers=auth),
+    }
+
+
+DEFAULT_SCENARIOS = [
+    "health", "auth_login", "trips_summary", "places_search", "places_search_cold", "places_details",
+    "places_autocomplete", "directions_day", "distance_matrix", "geocode_batch", "trips_generate",
+]
+
+
+async def _ticker(lags: List[float], stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+async def run_level(client: httpx.AsyncClient, scenario: Scenario, concurrency: int, total: int) -> Dict[str, Any]:
+    """Send `total` requests with `concurrency` workers in flight; summarize latencies and loop lag."""
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < total:
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, i)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "loop_lag_p99_ms": round(_percentile(lags, 99) * 1000, 2),
+        "loop_lag_max_ms": round(max(lags, default=0.0) * 1000, 2),
+    }
+
+
+async def setup(args) -> FakeGoogle:
+    """Point the app at the stand-ins and create the benchmark user."""
+    if args.mongo_url:
+        settings.MONGODB_URL = args.mongo_url
+        settings.MONGODB_DB_NAME = "tripstellar_bench"
+        await database.connect_db()
+        await database.get_db().users.delete_many({"email": EMAIL})
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        database.db = AsyncMongoMockClient()[settings.MONGODB_DB_NAME]
+
+    fake_google = FakeGoogle(latency_ms=args.google_latency_ms)
+    http_client._client = httpx.AsyncClient(transport=fake_google.transport())
+    await init_persistent_cache()
+
+    ai_service._llm = FakeChatModel(first_token_ms=args.llm_first_token_ms, tokens_per_second=args.llm_tokens_per_second)
+    ai_service._chains.clear()
+    auth_service.pwd_context.update(bcrypt__rounds=args.bcrypt_rounds, bcrypt__min_rounds=args.bcrypt_rounds)
+    return fake_google
+
+
+async def main(args):
+    fake_google = await setup(args)
+    transport = httpx.ASGITransport(app=app)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        response = await client.post("/api/auth/register", json={"name": "Bench", "email": EMAIL, "password": PASSWORD})
+        token = response.json()["access_token"]
+        scenarios = build_scenarios(token)
+
+        for name in args.scenarios:
+            scenario = scenarios[name]
+            await scenario(client, 0)  # warm imports and connection setup
+            results[name] = []
+            for concurrency in args.concurrency:
+                total = max(args.requests, concurrency)
+                if name.startswith("trips_generate"):
+                    total = max(args.generate_requests, concurrency)
+                level = await run_level(client, scenario, concurrency, total)
+                results[name].append(level)
+                print(
+                    f"{name:<20} c={concurrency:<4} n={total:<5} rps={level['rps']:<8} "
+                    f"p50={level['p50_ms']:<8} p95={level['p95_ms']:<8} p99={level['p99_ms']:<8} "
+                    f"err={level['errors']:<3} lag_p99={level['loop_lag_p99_ms']} lag_max={level['loop_lag_max_ms']}"
+                )
+
+    print(f"\nupstream calls: google={fake_google.calls} llm={ai_service._llm.calls}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results, "upstream": fake_google.calls}, f, indent=2)
+        print(f"results written to {args.json}")
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(v) for v in text.split(",") if v]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=lambda s: s.split(","), default=DEFAULT_SCENARIOS)
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--generate-requests", type=int, default=20, help="requests per level for trips_generate*")
+    parser.add_argument("--google-latency-ms", type=float, default=80.0)
+    parser.add_argument("--llm-first-token-ms", type=float, default=600.0)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=250.0)
+    parser.add_argument("--bcrypt-rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    parser.add_argument("--mongo-url", default=None, help="use a real MongoDB instead of mongomock")
+    parser.add_argument("--json", default=None, help="write results to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,112 @@
+"""
+Trip Serialization Micro-benchmark
+Per-trip cost of turning a stored trip document into response bytes, and of
+decoding those bytes again, for a large multi-day itinerary:
+
+  before: TripResponse(**doc) validation, response_model re-validation,
+          JSON-mode dump and json.dumps (FastAPI's default JSONResponse path)
+  after:  trip_document(doc) + orjson.dumps (ORJSONResponse, no validation)
+
+Run from backend/:  python -m benchmarks.serialization --days 14 --activities 8
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+import orjson
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from app.models import TripResponse
+from app.services.trip_service import trip_document
+
+
+def _stored_trip(days: int, activities: int) -> dict:
+    place = {
+        "name": "Museum of Something", "address": "1 Long Street Name, 75001 City, Country",
+        "rating": 4.7, "total_ratings": 12345, "price_level": 2,
+        "types": ["museum", "tourist_attraction", "point_of_interest"],
+        "photo_url": "https://example.com/" + "p" * 120, "place_id": "ChIJ" + "x" * 23,
+        "latitude": 48.8606, "longitude": 2.3376,
+        "opening_hours": ["Monday: 9:00 AM – 6:00 PM"] * 7, "website": "https://example.com",
+    }
+    activity = {
+        "time": "09:00 AM", "title": "Visit the museum", "description": "A long description. " * 8,
+        "duration": "2 hours", "place": place, "tips": "Book ahead. " * 4, "estimated_cost": "$25",
+    }
+    return {
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "request": {
+            "destination": "Paris, France", "start_date": "2026-05-01", "end_date": "2026-05-14",
+            "budget": "moderate", "travelers": 2, "travel_style": ["cultural", "foodie"],
+            "interests": ["art", "food"], "special_requirements": "",
+        },
+        "itinerary": {
+            "destination": "Paris, France", "summary": "Summary. " * 20, "total_days": days,
+            "best_time_to_visit": "Spring", "currency": "EUR", "language": "French",
+            "travel_tips": ["Tip"] * 8, "packing_list": ["Item"] * 10, "estimated_total_budget": "$3000",
+            "emergency_contacts": {"police": "17", "ambulance": "15"},
+            "days": [
+                {
+                    "day": d + 1, "date": f"2026-05-{d + 1:02d}", "theme": "Theme",
+                    "activities": [dict(activity) for _ in range(activities)],
+                    "meals": [dict(activity) for _ in range(3)], "accommodation_tip": "Stay central",
+                }
+                for d in range(days)
+            ],
+            "top_restaurants": [place] * 8,
+            "top_attractions": [place] * 10,
+        },
+        "created_at": datetime(2026, 4, 1, 12, 0, 0),
+    }
+
+
+def _before(doc: dict) -> bytes:
+    adapter = TypeAdapter(TripResponse)
+    trip = TripResponse(
+        id=str(doc["_id"]), user_id=doc.get("user_id"), request=doc["request"],
+        itinerary=doc["itinerary"], created_at=doc["created_at"],
+    )
+    # response_model validation of the returned value, then JSON-mode dump
+    content = adapter.dump_python(adapter.validate_python(trip.model_dump()), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _after(doc: dict) -> bytes:
+    return orjson.dumps(trip_document(doc), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _time(fn, arg, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(days: int, activities: int, repeat: int):
+    doc = _stored_trip(days, activities)
+    body = _after(doc)
+    assert json.loads(_before(doc)) == json.loads(body), "encoders disagree"
+
+    print(f"{days} days x {activities} activities, {len(body) / 1024:.0f} KiB per trip, {repeat} runs")
+    rows = [
+        ("encode before", _time(_before, doc, repeat)),
+        ("encode after", _time(_after, doc, repeat)),
+        ("decode json", _time(json.loads, body, repeat)),
+        ("decode orjson", _time(orjson.loads, body, repeat)),
+    ]
+    for name, ms in rows:
+        print(f"  {name:<14} {ms:8.3f} ms/trip")
+    print(f"  encode speed-up: {rows[0][1] / rows[1][1]:.1f}x, decode speed-up: {rows[2][1] / rows[3][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--activities", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.days, args.activities, args.repeat)
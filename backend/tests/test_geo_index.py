@@ -0,0 +1,40 @@
+from app.models import PlaceInfo
+from app.services.geo_index import GeoIndex, haversine_km
+
+
+def _place(name: str, lat: float, lng: float) -> PlaceInfo:
+    return PlaceInfo(name=name, address="", rating=4.5, latitude=lat, longitude=lng, place_id=name)
+
+
+def test_query_at_the_poles_is_bounded():
+    index = GeoIndex(cell_km=1.0)
+    index.add([_place("north", 89.8, 120.0), _place("south", -89.9, -45.0), _place("paris", 48.85, 2.35)])
+
+    north = index.query(90.0, 0.0, radius_km=50)
+    south = index.query(-90.0, 0.0, radius_km=50)
+    near = index.query(89.9, -60.0, radius_km=50)
+    # The full box spans every longitude; only the 3 populated cells may be visited
+    assert index.stats()["cells_visited"] <= 3 * 3
+
+    assert [p.name for p, _ in north] == ["north"]
+    assert [p.name for p, _ in south] == ["south"]
+    assert [p.name for p, _ in near] == ["north"]
+
+
+def test_query_wraps_at_the_antimeridian():
+    index = GeoIndex(cell_km=1.0)
+    index.add([_place("east", -16.5, 179.95), _place("west", -16.5, -179.95), _place("far", -16.5, 170.0)])
+
+    for lng in (180.0, -180.0, 179.99, -179.99):
+        found = sorted(p.name for p, _ in index.query(-16.5, lng, radius_km=20))
+        assert found == ["east", "west"]
+
+
+def test_query_matches_brute_force_in_dense_grid():
+    index = GeoIndex(cell_km=1.0)
+    places = [_place(f"p{i}-{j}", 48.8 + i * 0.01, 2.3 + j * 0.01) for i in range(10) for j in range(10)]
+    index.add(places)
+
+    found = {p.name for p, _ in index.query(48.85, 2.35, radius_km=3, limit=100)}
+    expected = {p.name for p in places if haversine_km(48.85, 2.35, p.latitude, p.longitude) <= 3}
+    assert found == expected